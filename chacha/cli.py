@@ -4,19 +4,29 @@ from __future__ import annotations
 
 import typer
 
-from chacha.commands import fix, explain, commit, setup
+from chacha.cli_lazy import LazyGroup
 
 
-app = typer.Typer(help="🕺 Chacha — your AI-powered CLI for explaining and committing code")
+class ChachaGroup(LazyGroup):
+    # Subcommands are imported on first use (see chacha/cli_lazy.py)
+    lazy_subcommands = {
+        "fix": ("chacha.commands.fix", "Run automatic fixes (placeholder)."),
+        "explain": ("chacha.commands.explain", "Explain a file or Git commit(s) with AI."),
+        "commit": ("chacha.commands.commit", "Generate a smart commit message and commit."),
+        "setup": ("chacha.commands.setup", "Setup the CLI."),
+    }
 
-# Register subcommands
-app.add_typer(fix.app, name="fix")
-app.add_typer(explain.app, name="explain")
-app.add_typer(commit.app, name="commit")
-app.add_typer(setup.app, name="setup")
 
+app = typer.Typer(
+    cls=ChachaGroup,
+    help="🕺 Chacha — your AI-powered CLI for explaining and committing code",
+)
 
-if __name__ == "__main__":  # pragma: no cover
-    app()
+
+@app.callback()
+def main() -> None:
+    pass
 
 
+if __name__ == "__main__":  # pragma: no cover
+    app()
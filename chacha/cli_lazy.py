@@ -0,0 +1,95 @@
+"""Lazy subcommand loading for the top-level CLI.
+
+Subcommand modules pull in questionary, the AI provider clients and the git
+helpers. Importing them only when their subcommand actually runs keeps
+`chacha --help` and shell completion fast.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+from typing import Any, Optional, Union
+
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+
+def _is_eager() -> bool:
+    v = (os.getenv("CHACHA_EAGER") or "").strip().lower()
+    return v in {"1", "true", "yes", "on"}
+
+
+def _load_typer_app(module_path: str, attr: str = "app", single: bool = False) -> Union[TyperCommand, TyperGroup]:
+    module = importlib.import_module(module_path)
+    sub_app = getattr(module, attr)
+    if single:
+        # The sub-app registers exactly one command; run it directly
+        return typer.main.get_command(sub_app)
+    # Otherwise build a group (like `add_typer`) so `chacha fix run` keeps
+    # working even when the sub-app only registers a single command.
+    return typer.main.get_group(sub_app)
+
+
+class LazyCommand(TyperCommand):
+    """Placeholder listed in help output; the real sub-app loads on first use."""
+
+    def __init__(
+        self,
+        name: str,
+        module_path: str,
+        attr: str = "app",
+        help: Optional[str] = None,
+        single: bool = False,
+    ) -> None:
+        super().__init__(name=name, help=help, callback=None)
+        self.module_path = module_path
+        self.attr = attr
+        self.single = single
+        self._real: Optional[Union[TyperCommand, TyperGroup]] = None
+
+    def load(self) -> Union[TyperCommand, TyperGroup]:
+        if self._real is None:
+            real = _load_typer_app(self.module_path, self.attr, self.single)
+            real.name = self.name
+            if not real.help and not real.short_help:
+                real.short_help = self.help
+            self._real = real
+        return self._real
+
+    def make_context(self, info_name: Optional[str], args: list[str], parent: Any = None, **extra: Any) -> Any:
+        # Both invocation and shell completion resolve subcommands through
+        # make_context, so handing back the real group's context is enough.
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+
+class LazyGroup(TyperGroup):
+    """Root group whose subcommands are declared as import paths.
+
+    Subclasses fill `lazy_subcommands` with `name -> (module_path, short_help)`
+    and list in `single_command_subcommands` the ones whose sub-app is one
+    plain `@app.command()` (loaded as that command, not wrapped in a group).
+    Set CHACHA_EAGER=1 to import every subcommand up front (surfaces import
+    errors immediately when debugging).
+    """
+
+    lazy_subcommands: dict[str, tuple[str, str]] = {}
+    single_command_subcommands: frozenset[str] = frozenset()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._lazy: dict[str, LazyCommand] = {
+            name: LazyCommand(name, module_path, help=short_help, single=name in self.single_command_subcommands)
+            for name, (module_path, short_help) in self.lazy_subcommands.items()
+        }
+
+    def list_commands(self, ctx: Any) -> list[str]:
+        return [*super().list_commands(ctx), *self._lazy]
+
+    def get_command(self, ctx: Any, cmd_name: str) -> Any:
+        lazy = self._lazy.get(cmd_name)
+        if lazy is None:
+            return super().get_command(ctx, cmd_name)
+        if _is_eager():
+            return lazy.load()
+        return lazy
@@ -2,29 +2,143 @@
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from typing import Optional
+
 import typer
-import questionary
-
-from chacha.utils.ai_utils import generate_commit_message
-from chacha.utils.git_utils import (
-    get_staged_diff,
-    get_staged_files,
-    get_all_changes_diff,
-    stage_files,
-    get_changed_files,
-    commit_and_push,
-    get_upstream_branch,
-)
 
 
 app = typer.Typer()
 
+# Diffs up to this many changed lines are checked for a canned commit message
+_TRIVIAL_MAX_LINES = 6
+# Comment syntax keyed on file extension; files not listed never count as
+# comment-only changes
+_HASH_COMMENTS = ("#",)
+_C_COMMENTS = ("//", "/*", "* ", "*/")
+_COMMENT_PREFIXES_BY_EXT = {
+    ".py": ("#", '"""', "'''"),
+    ".sh": _HASH_COMMENTS,
+    ".rb": _HASH_COMMENTS,
+    ".yml": _HASH_COMMENTS,
+    ".yaml": _HASH_COMMENTS,
+    ".toml": _HASH_COMMENTS,
+    ".c": _C_COMMENTS,
+    ".h": _C_COMMENTS,
+    ".cc": _C_COMMENTS,
+    ".cpp": _C_COMMENTS,
+    ".hpp": _C_COMMENTS,
+    ".cs": _C_COMMENTS,
+    ".go": _C_COMMENTS,
+    ".java": _C_COMMENTS,
+    ".js": _C_COMMENTS,
+    ".jsx": _C_COMMENTS,
+    ".ts": _C_COMMENTS,
+    ".tsx": _C_COMMENTS,
+    ".kt": _C_COMMENTS,
+    ".rs": _C_COMMENTS,
+    ".swift": _C_COMMENTS,
+}
+
+
+def _strip_lines(lines: list[str]) -> list[str]:
+    # Keeps line order: only indentation, trailing spaces and blank lines are ignored
+    return [text.strip() for text in lines if text.strip()]
+
+
+def _comment_prefixes(path: str) -> tuple[str, ...]:
+    return _COMMENT_PREFIXES_BY_EXT.get(os.path.splitext(path)[1].lower(), ())
+
+
+# Headers for changes a line-by-line comparison cannot see
+_STRUCTURAL_HEADERS = (
+    "Binary files",
+    "GIT binary patch",
+    "rename from",
+    "rename to",
+    "copy from",
+    "copy to",
+    "new file mode",
+    "deleted file mode",
+    "old mode",
+    "new mode",
+)
+
+
+def _classify_trivial(diff: str, files: list[str]) -> Optional[str]:
+    """Return a template commit message for whitespace/comment-only diffs, else None."""
+    changed_lines = 0
+    whitespace_only = True
+    comment_only = True
+    path = ""
+    # The current run of consecutive -/+ lines within one hunk
+    removed: list[str] = []
+    added: list[str] = []
+
+    def flush() -> None:
+        nonlocal whitespace_only
+        # Removed and added lines are paired by position within the run
+        if _strip_lines(removed) != _strip_lines(added):
+            whitespace_only = False
+        removed.clear()
+        added.clear()
+
+    for line in diff.splitlines():
+        if line.startswith(_STRUCTURAL_HEADERS):
+            return None
+        # Track the file each hunk belongs to ("+++ /dev/null" for deletions)
+        if line.startswith("--- a/"):
+            path = line[6:]
+            continue
+        if line.startswith("+++ b/"):
+            path = line[6:]
+            continue
+        if line.startswith(("+++", "---")):
+            continue
+        if line[:1] == "+":
+            added.append(line[1:])
+        elif line[:1] == "-":
+            removed.append(line[1:])
+        else:
+            # Context, hunk or file header: the run ends here
+            flush()
+            continue
+        changed_lines += 1
+        if changed_lines > _TRIVIAL_MAX_LINES:
+            return None
+        text = line[1:].strip()
+        prefixes = _comment_prefixes(path)
+        if text and not (prefixes and text.startswith(prefixes)):
+            comment_only = False
+    flush()
+    if not changed_lines:
+        return None
+    target = files[0] if len(files) == 1 else "multiple files"
+    # Each run has the same lines in the same order once indentation,
+    # trailing spaces and blank lines are ignored
+    if whitespace_only:
+        return f"chore: whitespace cleanup in {target}"
+    if comment_only:
+        return f"docs: update comments in {target}"
+    return None
+
 
 @app.command()
 def run(
     auto: bool = typer.Option(False, "--auto", "-a", help="Automatically commit with generated message"),
 ) -> None:
     """Generate a smart commit message from staged changes."""
+    # Heavy imports are deferred so `commit --help` only pays for argument parsing
+    from chacha.utils.git_utils import (
+        get_staged_diff,
+        stage_files,
+        get_changed_files,
+        commit_and_push,
+        get_upstream_branch,
+    )
+
     # Get all changed files with their status
     all_files = get_changed_files()
     
@@ -36,6 +150,8 @@ def run(
     if auto:
         files_to_stage = all_files
     else:
+        import questionary
+
         files_to_stage = questionary.checkbox(
             "Select files to stage",
             choices=all_files,
@@ -51,20 +167,32 @@ def run(
 
     typer.echo("✅ Files staged successfully!\n")
     
-    # Get the diff of staged files
-    diff = get_staged_diff()
-    
-    if not diff.strip():
-        typer.echo("⚠️ No diff available for staged files.")
-        raise typer.Exit(1)
-    
-    typer.echo(f"📝 Files to commit: {', '.join(all_files)}")
-    typer.echo("🤖 Generating commit message...\n")
-    
-    # Generate commit message
-    commit_message = generate_commit_message(diff, all_files)
+    # The upstream lookup and the AI helper import don't depend on the diff;
+    # run them in the background while the diff is read and the message generated
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        branch_future = executor.submit(get_upstream_branch)
+        executor.submit(import_module, "chacha.utils.ai_utils")
+
+        # Get the diff of staged files
+        diff = get_staged_diff()
+        
+        if not diff.strip():
+            typer.echo("⚠️ No diff available for staged files.")
+            raise typer.Exit(1)
+        
+        typer.echo(f"📝 Files to commit: {', '.join(files_to_stage)}")
+        typer.echo("🤖 Generating commit message...\n")
+        
+        # Generate commit message (whitespace/comment-only diffs skip the AI call)
+        commit_message = _classify_trivial(diff, files_to_stage)
+        if commit_message is None:
+            from chacha.utils.ai_utils import generate_commit_message
+
+            commit_message = generate_commit_message(diff, files_to_stage)
+        branch_name = branch_future.result()
     
-    branch_name = get_upstream_branch()
+    import questionary
+
     if not branch_name:
         branch_name = questionary.text("No upstream branch found. Enter branch name to push to:", default="").ask()
         if branch_name:
@@ -2,22 +2,34 @@
 
 from __future__ import annotations
 
-import typer
+from typing import List
 
-from chacha.utils.ai_utils import explain_file
-from . import explain_commit
+import typer
 
+from chacha.cli_lazy import LazyGroup
 
-app = typer.Typer()
 
-app.add_typer(explain_commit.app, name="commit")
+class ExplainGroup(LazyGroup):
+    # `explain commit` pulls in the git helpers; load it only when used
+    lazy_subcommands = {
+        "commit": ("chacha.commands.explain_commit", "Explain one commit, or N commits cohesively."),
+    }
+    # explain_commit registers a single command; skip the group dispatch layer
+    single_command_subcommands = frozenset({"commit"})
 
 
-@app.command()
-def file(path: str) -> None:
-    """Explain a file (code or PDF) using Claude."""
-    typer.echo(f"🧠 Explaining {path}...")
-    explanation = explain_file(path)
-    typer.echo(explanation)
+app = typer.Typer(cls=ExplainGroup)
 
 
+@app.command()
+def file(paths: List[str]) -> None:
+    """Explain one or more files (code or PDF) using Claude."""
+    # Function-local import: the AI client stack is only needed here
+    from chacha.utils.ai_utils import explain_files
+
+    typer.echo(f"🧠 Explaining {', '.join(paths)}...")
+    # Several files are requested concurrently; output stays in argument order
+    for path, explanation in zip(paths, explain_files(paths)):
+        if len(paths) > 1:
+            typer.echo(f"\n── {path} ──")
+        typer.echo(explanation)
@@ -2,35 +2,37 @@
 
 from __future__ import annotations
 
+import heapq
 import os
 import typer
-from typing import Optional, List
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, Optional, List
 import re
 
-from chacha.utils import ui_utils
-from chacha.utils.ai_utils import generate_text, get_provider
+from chacha.utils import explain_cache, ui_utils
 from chacha.utils.git_utils import (
     resolve_commit_sha,
-    rev_list,
+    resolve_commit_shas,
+    rev_list_with_subjects,
     get_commit_subject,
-    get_commit_author,
-    get_commit_date,
-    get_commit_body,
-    get_commit_files_changed,
+    get_commit_bundle,
     get_commit_stats,
     get_commit_patch,
     get_commit_parents,
     get_empty_tree_sha,
     get_cumulative_diff_patch,
-    get_cumulative_diff_shortstat,
-    get_cumulative_diff_numstat,
+    get_cumulative_diff_stats,
     split_patch_by_file,
     get_commit_numstat,
 )
 
 
-app = typer.Typer(
-    invoke_without_command=True,
+# Completion is installed from the root `chacha` app, not per subcommand
+app = typer.Typer(add_completion=False)
+
+
+@app.command(
     help=(
         "Two modes:\n"
         "- Single commit: chacha explain commit [TARGET] or --spec <ref>\n"
@@ -39,9 +41,6 @@ app = typer.Typer(
         "Tip: For negative TARGET (e.g., -2), use `--` (e.g., `... -- -2`) or `--spec -2`."
     ),
 )
-
-
-@app.callback()
 def main(
     target: Optional[str] = typer.Argument(
         None,
@@ -60,27 +59,49 @@ def main(
     ),
 ) -> None:
     """Explain one commit by default, or N commits cohesively with -c/--cohesive."""
+    if cohesive and cohesive <= 0:
+        typer.echo("❌ --cohesive must be a positive integer.", err=True)
+        raise typer.Exit(code=1)
+
+    # Enforce mutually exclusive modes: cohesive ignores TARGET/--spec
+    if cohesive and (target is not None or spec is not None):
+        typer.echo("❌ Do not combine --cohesive with TARGET/--spec. Use one mode at a time.", err=True)
+        raise typer.Exit(code=2)
+
+    # Imported after argument checks so usage errors never load the provider stack
+    from chacha.utils.ai_utils import get_api_key, get_provider
+
     try:
         provider = get_provider()
     except Exception:
         provider = "unknown"
-
-    if cohesive and cohesive <= 0:
-        typer.echo("❌ --cohesive must be a positive integer.", err=True)
-        raise typer.Exit(code=1)
+    else:
+        # Requests fan out to worker threads; resolve the key (and run any
+        # interactive setup prompt) once, here, before that happens
+        try:
+            get_api_key(provider)
+        except ValueError:
+            # Raised again by the first request, as before
+            pass
 
     if cohesive:
-        # Enforce mutually exclusive modes: cohesive ignores TARGET/--spec
-        if target is not None or spec is not None:
-            typer.echo("❌ Do not combine --cohesive with TARGET/--spec. Use one mode at a time.", err=True)
-            raise typer.Exit(code=2)
         explain_commits_cohesively(None, cohesive, provider)
     else:
         effective_target = spec if spec is not None else target
         explain_single_commit(effective_target, provider)
 
 
+# Prefix used by ai_utils for "no usable response" messages
+_WARN = "⚠️"
+
+def _is_warning(response: object) -> bool:
+    # Responses rarely start with whitespace; only lstrip when the fast check misses
+    return isinstance(response, str) and (response.startswith(_WARN) or response.lstrip().startswith(_WARN))
+
 def _truncate(text: str, limit: int) -> str:
+    # Hot path: nearly every caller passes text that already fits
+    if type(text) is str and len(text) <= limit:
+        return text
     if not isinstance(text, str):
         return ""
     if len(text) <= limit:
@@ -90,20 +111,192 @@ def _truncate(text: str, limit: int) -> str:
 def _truncate_words(text: str, max_words: int) -> str:
     if not isinstance(text, str):
         return ""
+    # N words need at least 2N-1 characters, so shorter text cannot overflow
+    if len(text) < 2 * max_words:
+        return text
     words = text.split()
     if len(words) <= max_words:
         return text
     return " ".join(words[:max_words]) + " …"
 
-def _estimate_tokens(text: str) -> int:
-    # Rough heuristic: ~1.3 tokens per word
+def _count_words(text: str) -> int:
     if not isinstance(text, str) or not text:
         return 0
-    return int(len(text.split()) * 1.3)
+    return len(text.split())
+
+def _tokens_for_words(words: int) -> int:
+    # Rough heuristic: ~1.3 tokens per word
+    return int(words * 1.3)
+
+def _estimate_tokens(text: str) -> int:
+    return _tokens_for_words(_count_words(text))
 
 # Token budgets (overridable via env)
 MAX_PROMPT_TOKENS = int(os.getenv("CHACHA_MAX_PROMPT_TOKENS", "6000"))
 MAX_SUMMARY_TOKENS = int(os.getenv("CHACHA_MAX_SUMMARY_TOKENS", "1500"))
+# Commit bodies beyond this many characters are cut before prompting
+MAX_BODY_CHARS = 2000
+# Noise filters for per-file summaries (generated, vendored and non-code files)
+_SKIP_DIRS_RE = re.compile(r"/dist/|/build/|/\.next/|/out/|node_modules/|vendor/|__snapshots__/")
+_SKIP_SUFFIXES = (
+    ".lock", ".min.js", ".map", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".webp",
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml",
+)
+# Generated files excluded from patches at the git level (pathspec globs)
+_NOISE_PATHSPECS = ("*.lock", "*.min.js", "*.map", "*package-lock.json", "*pnpm-lock.yaml")
+_CODE_EXTS = (".py", ".ts", ".tsx", ".js", ".jsx", ".go", ".rb", ".rs", ".java", ".kt", ".swift", ".c", ".cc", ".cpp", ".h", ".hpp", ".cs")
+
+# Rows ranked up front when picking the highest-churn files to summarize
+_CHURN_CANDIDATES = 50
+
+
+def _collect_chunks(patch: str, wanted: set[str]) -> dict[str, str]:
+    """Return the per-file chunks of `patch` for `wanted` paths only."""
+    chunks: dict[str, str] = {}
+    if not wanted:
+        return chunks
+    for path, chunk in split_patch_by_file(patch):
+        if path in wanted:
+            chunks[path] = chunk
+            if len(chunks) == len(wanted):
+                break
+    return chunks
+
+
+def _churn(row: tuple[int, int, str]) -> int:
+    return row[0] + row[1]
+
+
+# Cumulative and base-commit selection often rank the same paths
+@lru_cache(maxsize=4096)
+def _should_skip_file(path: str) -> bool:
+    p = path.lower()
+    if not p:
+        return True
+    # Skip common noisy/generated files
+    if _SKIP_DIRS_RE.search(p):
+        return True
+    if p.endswith(_SKIP_SUFFIXES):
+        return True
+    # Prefer code files; deprioritize non-code
+    return not p.endswith(_CODE_EXTS)
+
+
+def _pick_files(rows: list[tuple[int, int, str]], patch: str, limit: int) -> tuple[list[tuple[int, int, str]], dict[str, str]]:
+    # Only chunks for wanted paths are kept; the patch is scanned lazily
+    # and the scan stops once every wanted path has been seen.
+    wanted = [row for row in rows if not _should_skip_file(row[2])]
+    chunks = _collect_chunks(patch, {path for _, _, path in wanted})
+    # nlargest is stable, so this matches sorting by churn and slicing
+    picked = heapq.nlargest(limit, (row for row in wanted if row[2] in chunks), key=_churn)
+    return picked, chunks
+
+
+def _select_by_churn(
+    rows: list[tuple[int, int, str]],
+    patch: str,
+    limit: int,
+    candidates: Optional[list[tuple[int, int, str]]] = None,
+) -> tuple[list[tuple[int, int, str]], dict[str, str]]:
+    # Rank a bounded candidate set first; only fall back to every row when
+    # the noise filter rejects too many of the top ones. Callers that
+    # already ranked the rows pass the top `_CHURN_CANDIDATES` in.
+    if candidates is None:
+        candidates = heapq.nlargest(_CHURN_CANDIDATES, rows, key=_churn)
+    selected, chunks = _pick_files(candidates, patch, limit)
+    if len(selected) < limit and len(rows) > len(candidates):
+        selected, chunks = _pick_files(rows, patch, limit)
+    return selected, chunks
+
+
+# Concurrent provider requests for per-file and base-commit summaries
+MAX_PARALLEL_REQUESTS = int(os.getenv("CHACHA_MAX_PARALLEL_REQUESTS", "6"))
+# Concurrent git subprocesses when cohesive mode gathers its inputs
+GIT_READ_WORKERS = max(1, int(os.getenv("CHACHA_GIT_THREADS", "5")))
+# Send summary prompts as one provider batch job: half the cost, minutes slower
+USE_BATCH_API = (os.getenv("CHACHA_BATCH") or "").strip().lower() in {"1", "true", "yes", "on"}
+
+def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0.2) -> str:
+    """Proxy to ai_utils.generate_text, imported on first use.
+
+    The provider stack (requests, PDF support, SDKs) is only loaded once a
+    request is actually sent, so `--help` and argument errors stay fast.
+    """
+    from chacha.utils.ai_utils import generate_text as _generate_text
+
+    return _generate_text(prompt, max_tokens=max_tokens, temperature=temperature)
+
+
+def _model_for(provider: str) -> str:
+    # Part of the cache key, so switching models never serves the old model's answers
+    from chacha.utils.ai_utils import get_model
+
+    return get_model(provider)
+
+
+def _generate_cached(prompt: str, *, max_tokens: int, temperature: float, cache_sha: str = "", provider: str = "") -> str:
+    """generate_text with the on-disk explain cache in front (warnings are never cached)."""
+    model = _model_for(provider)
+    cached = explain_cache.get(cache_sha, prompt, provider, model)
+    if cached is not None:
+        return cached
+    response = generate_text(prompt, max_tokens=max_tokens, temperature=temperature)
+    if not _is_warning(response):
+        explain_cache.put(cache_sha, prompt, response, provider, model)
+    return response
+
+def _submit_many(
+    ex: Executor, prompts: List[str], *, max_tokens: int, temperature: float, cache_sha: str = "", provider: str = ""
+) -> List[Future[str]]:
+    """Queue independent generate_text calls on `ex`; futures keep prompt order."""
+    if USE_BATCH_API and provider == "anthropic":
+        return _submit_batch(ex, prompts, max_tokens=max_tokens, temperature=temperature, cache_sha=cache_sha, provider=provider)
+    return [
+        ex.submit(
+            _generate_cached, p, max_tokens=max_tokens, temperature=temperature, cache_sha=cache_sha, provider=provider
+        )
+        for p in prompts
+    ]
+
+def _submit_batch(
+    ex: Executor, prompts: List[str], *, max_tokens: int, temperature: float, cache_sha: str = "", provider: str = ""
+) -> List[Future[str]]:
+    """Like _submit_many, but cache misses go out as a single batch job on `ex`."""
+    futures: List[Future[str]] = [Future() for _ in prompts]
+    misses: list[tuple[Future[str], str]] = []
+    model = _model_for(provider)
+    for fut, prompt in zip(futures, prompts):
+        cached = explain_cache.get(cache_sha, prompt, provider, model)
+        if cached is None:
+            misses.append((fut, prompt))
+        else:
+            fut.set_result(cached)
+
+    def _run() -> None:
+        from chacha.utils.ai_utils import generate_texts_batch
+
+        try:
+            responses = generate_texts_batch(
+                [prompt for _, prompt in misses], max_tokens=max_tokens, temperature=temperature
+            )
+        except Exception as exc:
+            for fut, _ in misses:
+                fut.set_exception(exc)
+            return
+        for (fut, prompt), response in zip(misses, responses):
+            if not _is_warning(response):
+                explain_cache.put(cache_sha, prompt, response, provider, model)
+            fut.set_result(response)
+
+    if misses:
+        ex.submit(_run)
+    return futures
+
+# Markdown artifacts stripped from model output, compiled once
+_RE_MD_HEADER = re.compile(r"^#{1,6}\s*")
+_RE_NUM_BULLET = re.compile(r"^\d+[\.\)]\s+")
+_RE_CODE_FENCE = re.compile(r"^\s*```")
+_RE_MD_EMPH = re.compile(r"\*\*|__|_")
 
 def _sanitize_to_plain_bullets(text: str, max_lines: int = 30) -> str:
     """Convert arbitrary markdown-ish text to plain '-' bullets and strip markdown artifacts."""
@@ -113,7 +306,7 @@ def _sanitize_to_plain_bullets(text: str, max_lines: int = 30) -> str:
     in_code_block = False
     for raw in text.splitlines():
         line = raw.rstrip()
-        if line.strip().startswith("```"):
+        if _RE_CODE_FENCE.match(line):
             in_code_block = not in_code_block
             continue
         if in_code_block:
@@ -122,16 +315,17 @@ def _sanitize_to_plain_bullets(text: str, max_lines: int = 30) -> str:
         if not stripped:
             continue
         # Drop markdown headers and emphasis
-        stripped = re.sub(r"^#{1,6}\s*", "", stripped)
-        stripped = stripped.replace("**", "").replace("__", "").replace("_", "")
-        # Normalize bullets/numbered lists
-        if re.match(r"^\d+[\.\)]\s+", stripped):
-            stripped = re.sub(r"^\d+[\.\)]\s+", "- ", stripped)
-        elif stripped.startswith(("* ", "• ", "– ", "— ")):
-            stripped = "- " + stripped[2:].lstrip()
-        elif stripped.startswith("- "):
+        stripped = _RE_MD_HEADER.sub("", stripped, count=1)
+        stripped = _RE_MD_EMPH.sub("", stripped)
+        # Normalize bullets/numbered lists; cheap prefix checks run first and
+        # the regex only sees lines that start with a digit
+        if stripped.startswith("- "):
             # already ok
             pass
+        elif stripped.startswith(("* ", "• ", "– ", "— ")):
+            stripped = "- " + stripped[2:].lstrip()
+        elif stripped[:1].isdigit() and (num_bullet := _RE_NUM_BULLET.match(stripped)):
+            stripped = "- " + stripped[num_bullet.end():]
         else:
             # Make non-bullet lines bullets for uniformity
             stripped = "- " + stripped
@@ -142,471 +336,444 @@ def _sanitize_to_plain_bullets(text: str, max_lines: int = 30) -> str:
         return ""
     return "\n".join(lines)
 
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield newline-delimited lines of `text` lazily; a trailing CR is dropped as splitlines would."""
+    start = 0
+    end_of_text = len(text)
+    while start < end_of_text:
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end].removesuffix("\r")
+        start = end + 1
+
 def _extract_top_hunks(diff_chunk: str, max_hunks: int = 2, max_lines_per_hunk: int = 60) -> str:
     """Return up to `max_hunks` hunks from a unified diff chunk, each truncated to `max_lines_per_hunk` lines.
     Keeps headers and context to remain readable while minimizing tokens.
     """
     if not diff_chunk:
         return ""
-    lines = diff_chunk.splitlines()
-    hunks: list[list[str]] = []
+    # Single lazy pass: lines are sliced out only as they are reached, reading
+    # stops as soon as `max_hunks` hunks are complete, and no more than
+    # `max_lines_per_hunk` lines of the hunk being read are kept.
+    selected: list[str] = []
     current: list[str] = []
-    found_hunk = False
-    for line in lines:
+    overflow = False
+    for line in _iter_lines(diff_chunk):
         if line.startswith("@@"):
             # Start of a new hunk
             if current:
-                hunks.append(current)
+                selected.append("\n".join(current + ["…"] if overflow else current))
                 current = []
+                if len(selected) >= max_hunks:
+                    break
             current.append(line)
-            found_hunk = True
-        else:
-            if found_hunk:
+            overflow = False
+        elif current:
+            if len(current) < max_lines_per_hunk:
                 current.append(line)
-    if current:
-        hunks.append(current)
+            else:
+                overflow = True
+    if current and len(selected) < max_hunks:
+        selected.append("\n".join(current + ["…"] if overflow else current))
     # If no explicit hunks, fall back to head of the file diff
-    if not hunks:
+    if not selected:
         return _truncate(diff_chunk, max_lines_per_hunk * 80)
-    # Take top hunks
-    selected: list[str] = []
-    for hunk in hunks[:max_hunks]:
-        if len(hunk) > max_lines_per_hunk:
-            selected.append("\n".join(hunk[:max_lines_per_hunk] + ["…"]))
-        else:
-            selected.append("\n".join(hunk))
     return "\n".join(selected)
 
-def explain_single_commit(target: Optional[str], provider: str) -> None:
-    # Start spinner immediately
-    _sp = ui_utils.spinner("explain ", progress=True)
-    _sp.__enter__()
-    box: str = ""
-    try:
-        commit_spec = target or "-1"
-        sha = resolve_commit_sha(commit_spec)
-        if not sha:
-            typer.echo(f"❌ Could not resolve commit: {commit_spec}", err=True)
-            raise typer.Exit(code=1)
-
-        subject = get_commit_subject(sha)
-        author = get_commit_author(sha)
-        date = get_commit_date(sha)
-        body = get_commit_body(sha)
-        files = get_commit_files_changed(sha)
-        stats = get_commit_stats(sha)
-        # Keep patch smaller to reduce prompt bloat; we will also trim to top hunks
-        raw_patch = get_commit_patch(sha, max_bytes=40_000)
-        trimmed_patch = _extract_top_hunks(raw_patch, max_hunks=3, max_lines_per_hunk=60)
-
-        files_preview = "\n".join(f"- {f}" for f in files[:50])
-        if len(files) > 50:
-            files_preview += f"\n… (+{len(files) - 50} more)"
-
-        prompt_parts: List[str] = [
-            "You are a senior engineer. Explain this Git commit for a code review summary.",
-            "",
-            "Output format requirements:",
-            "- Plain text only with simple '-' bullets",
-            "- No markdown (no bold, headers, tables, code fences)",
-            "- Be concise (<=200 words total)",
-            "",
-            "Please produce bullets for:",
-            "- TL;DR",
-            "- Key changes",
-            "- Potential risks or regressions",
-            "- Tests to add or update",
-            "",
-            "Commit Metadata:",
-            f"- SHA: {sha}",
-            f"- Author: {author}",
-            f"- Date: {date}",
-            f"- Subject: {subject}",
-        ]
-        if body.strip():
-            prompt_parts.extend(["- Body:", body.strip()])
-        prompt_parts.extend(
-            [
-                "",
-                "Files Changed:",
-                files_preview or "(none listed)",
-                "",
-                "Stats:",
-                stats or "(no stats)",
-            ]
+# Single-commit prompt; `body_block` is empty or starts with a newline
+_SINGLE_COMMIT_TEMPLATE = """You are a senior engineer. Explain this Git commit for a code review summary.
+
+Output format requirements:
+- Plain text only with simple '-' bullets
+- No markdown (no bold, headers, tables, code fences)
+- Be concise (<={words} words total)
+
+Please produce bullets for:
+- TL;DR
+- Key changes
+- Potential risks or regressions
+- Tests to add or update
+
+Commit Metadata:
+- SHA: {sha}
+- Author: {author}
+- Date: {date}
+- Subject: {subject}{body_block}
+
+Files Changed:
+{files_block}
+
+Stats:
+{stats_block}"""
+
+# Static sections of the cohesive prompt; only the middle varies per run
+_COHESIVE_INTRO = """You are a senior engineer. Explain these commits as a cohesive change set.
+Focus on the overarching goal, evolution across commits, and net outcomes.
+
+Output format requirements:
+- Plain text with simple '-' bullets only
+- No markdown (no bold, headers, tables, code fences)
+- Be concise (<=280 words total)"""
+_COHESIVE_OUTRO = """Please produce:
+- TL;DR
+- Key changes by theme
+- Risks and potential regressions
+- Tests to add or update"""
+# Shorter variants used once the prompt has to be pruned to fit the budget
+_COHESIVE_INTRO_COMPACT = """You are a senior engineer. Explain these commits as a cohesive change set (<=500 words).
+Focus on the overarching goal, how changes evolve across the set, and net outcomes."""
+_COHESIVE_OUTRO_COMPACT = """Please produce:
+- TL;DR (1-2 sentences)
+- Key changes by theme (bulleted)
+- Risks and potential regressions
+- Tests to add or update"""
+# Summary lines kept when the per-file section runs over 4000 characters
+_MAX_CAPPED_SUMMARIES = 4
+
+_COHESIVE_FRAME_WORDS = _count_words(_COHESIVE_INTRO) + _count_words(_COHESIVE_OUTRO)
+_COHESIVE_COMPACT_FRAME_WORDS = _count_words(_COHESIVE_INTRO_COMPACT) + _count_words(_COHESIVE_OUTRO_COMPACT)
+
+def _build_cohesive_prompt(
+    intro: str,
+    outro: str,
+    commit_range: str,
+    subjects_block: str,
+    base_lines: List[str],
+    shortstat: str,
+    file_lines: List[str],
+) -> str:
+    base_block = "\n".join(base_lines)
+    files_block = "\n".join(file_lines)
+    return f"""{intro}
+
+Commit range: {commit_range}
+
+Commits (oldest → newest):
+{subjects_block}
+
+Base commit (compressed view):
+{base_block}
+
+Cumulative shortstat:
+{shortstat or "(none)"}
+
+Net-new since base (top files, compressed):
+{files_block}
+
+{outro}"""
+
+def _single_commit_box(target: Optional[str], provider: str) -> str:
+    commit_spec = target or "-1"
+    sha = resolve_commit_sha(commit_spec)
+    if not sha:
+        typer.echo(f"❌ Could not resolve commit: {commit_spec}", err=True)
+        raise typer.Exit(code=1)
+
+    # Metadata, file list and stats come from one `git show`
+    meta, files, stats = get_commit_bundle(sha)
+    subject = meta["subject"]
+    author = meta["author"]
+    date = meta["date"]
+    body = meta["body"]
+
+    preview_lines = [f"- {f}" for f in files[:50]]
+    if len(files) > 50:
+        preview_lines.append(f"… (+{len(files) - 50} more)")
+    files_preview = "\n".join(preview_lines)
+
+    # Merges list no files (the combined diff is empty) yet their first-parent
+    # stats can still show real changes, so only skip the provider for commits
+    # with at most one parent or with nothing below the stats header line
+    no_changes = not files and (len(get_commit_parents(sha)) <= 1 or not stats.partition("\n")[2].strip())
+    if no_changes:
+        # Empty commits and clean merges change no files; there is nothing
+        # for the provider to explain, so skip the round-trip.
+        response = f"- TL;DR: {subject or '(no subject)'}\n- No file changes (empty or merge commit)."
+    else:
+        body_text = _truncate(body.strip(), MAX_BODY_CHARS)
+        files_block = files_preview or "(none listed)"
+        stats_block = stats or "(no stats)"
+        body_block = f"\n- Body:\n{body_text}" if body_text else ""
+        prompt = _SINGLE_COMMIT_TEMPLATE.format(
+            words=200,
+            sha=sha,
+            author=author,
+            date=date,
+            subject=subject,
+            body_block=body_block,
+            files_block=files_block,
+            stats_block=stats_block,
         )
-        prompt = "\n".join(prompt_parts)
-        # Ensure prompt stays under budget by dropping the diff if necessary
+        # Ensure prompt stays under budget by trimming the body if necessary
         if _estimate_tokens(prompt) > MAX_PROMPT_TOKENS:
-            prompt = "\n".join(
-                [
-                    "You are a senior engineer. Explain this Git commit for a code review summary.",
-                    "",
-                    "Output format requirements:",
-                    "- Plain text only with simple '-' bullets",
-                    "- No markdown (no bold, headers, tables, code fences)",
-                    "- Be concise (<=180 words total)",
-                    "",
-                    "Please produce bullets for:",
-                    "- TL;DR",
-                    "- Key changes",
-                    "- Potential risks or regressions",
-                    "- Tests to add or update",
-                    "",
-                    "Commit Metadata:",
-                    f"- SHA: {sha}",
-                    f"- Author: {author}",
-                    f"- Date: {date}",
-                    f"- Subject: {subject}",
-                    *(["- Body:", _truncate_words(body.strip(), 120)] if body.strip() else []),
-                    "",
-                    "Files Changed:",
-                    files_preview or "(none listed)",
-                    "",
-                    "Stats:",
-                    stats or "(no stats)",
-                ]
+            body_block = f"\n- Body:\n{_truncate_words(body_text, 120)}" if body_text else ""
+            prompt = _SINGLE_COMMIT_TEMPLATE.format(
+                words=180,
+                sha=sha,
+                author=author,
+                date=date,
+                subject=subject,
+                body_block=body_block,
+                files_block=files_block,
+                stats_block=stats_block,
             )
 
-        response = generate_text(prompt, max_tokens=1800, temperature=0.0)
+        response = _generate_cached(prompt, max_tokens=1800, temperature=0.0, cache_sha=sha, provider=provider)
         # Fallback if provider returned no text
-        if isinstance(response, str) and response.strip().startswith("⚠️"):
-            compact = "\n".join(
-                [
-                    "Explain this commit succinctly as plain '-' bullets (<=160 words). No markdown.",
-                    f"SHA: {sha}",
-                    f"Subject: {subject}",
-                    "Files:",
-                    files_preview or "(none)",
-                    "Stats:",
-                    stats or "(no stats)",
-                ]
-            )
+        if _is_warning(response):
+            compact = f"""Explain this commit succinctly as plain '-' bullets (<=160 words). No markdown.
+SHA: {sha}
+Subject: {subject}
+Files:
+{files_preview or "(none)"}
+Stats:
+{stats_block}"""
             response = generate_text(compact, max_tokens=700, temperature=0.0)
-        response = _sanitize_to_plain_bullets(response, max_lines=28)
-        # Prepare box (print after stopping spinner)
-        box = ui_utils.format_box(
-            title="Chacha — Commit Explanation",
-            subtitle=f"Provider: {provider}  •  Commit: {sha[:12]}",
-            content=response,
-        )
-    finally:
-        _sp.__exit__(None, None, None)
+    response = _sanitize_to_plain_bullets(response, max_lines=28)
+    # Prepare box (printed after the spinner stops)
+    return ui_utils.format_panel(
+        title="Chacha — Commit Explanation",
+        subtitle=f"Provider: {provider}  •  Commit: {sha[:12]}",
+        content=response,
+    )
+
+
+def explain_single_commit(target: Optional[str], provider: str) -> None:
+    # The spinner covers the git reads as well as the provider call
+    with ui_utils.spinner("explain ", progress=True):
+        box = _single_commit_box(target, provider)
     if box:
         typer.echo(box)
 
 
-def explain_commits_cohesively(anchor_spec: Optional[str], count: int, provider: str) -> None:
+def _cohesive_box(count: int, provider: str) -> str:
     # True cohesive mode: cumulative diff from HEAD~N .. HEAD, with commit subjects context.
-    if count < 1:
-        typer.echo("❌ --cohesive N must be >= 1.", err=True)
-        raise typer.Exit(code=1)
-
-    anchor_sha = resolve_commit_sha("HEAD")
+    anchor_sha, base_sha = resolve_commit_shas(["HEAD", f"HEAD~{count}"])
     if not anchor_sha:
         typer.echo("❌ Could not resolve HEAD.", err=True)
         raise typer.Exit(code=1)
-
-    base_expr = f"HEAD~{count}"
-    base_sha = resolve_commit_sha(base_expr) or get_empty_tree_sha()
-
-    # Context commits (oldest -> newest)
-    newest_to_oldest = rev_list(anchor_sha, count)
-    shas = list(reversed(newest_to_oldest)) if newest_to_oldest else []
-    subjects = [get_commit_subject(sha) for sha in shas]
+    base_sha = base_sha or get_empty_tree_sha()
+
+    # The git reads below only depend on the two SHAs, so they run on a small
+    # pool while the commit subjects are fetched on this thread.
+    with ThreadPoolExecutor(max_workers=GIT_READ_WORKERS) as git_pool:
+        stats_future = git_pool.submit(get_cumulative_diff_stats, base_sha, anchor_sha)
+        patch_future = git_pool.submit(
+            get_cumulative_diff_patch, base_sha, anchor_sha, max_bytes=30_000, exclude=_NOISE_PATHSPECS
+        )
+        base_stats_future = git_pool.submit(get_commit_stats, base_sha)
+        base_patch_future = git_pool.submit(get_commit_patch, base_sha, max_bytes=20_000, exclude=_NOISE_PATHSPECS)
+        base_numstat_future = git_pool.submit(get_commit_numstat, base_sha)
+
+        # Context commits and their subjects come from one `git log`. One extra
+        # entry is read: on linear history it is the base commit; otherwise
+        # (merges, or a base that is the empty tree) the base is looked up.
+        history = rev_list_with_subjects(anchor_sha, count + 1)
+        context = list(reversed(history[:count]))  # oldest -> newest
+        shas = [sha for sha, _ in context]
+        subjects = [subject for _, subject in context]
+        if len(history) > count and history[count][0] == base_sha:
+            base_subject = history[count][1]
+        else:
+            base_subject = get_commit_subject(base_sha)
+    n_shas = len(shas)
     subjects_bullets = "\n".join(
-        f"- {i+1}/{len(shas)} {shas[i][:12]} — {subjects[i]}" for i in range(len(shas))
+        f"- {i}/{n_shas} {sha[:12]} — {subject}" for i, (sha, subject) in enumerate(zip(shas, subjects), 1)
     ) or "(no subjects)"
 
     # Cumulative stats and top files
-    shortstat = get_cumulative_diff_shortstat(base_sha, anchor_sha)
-    numstat_rows = get_cumulative_diff_numstat(base_sha, anchor_sha)
-    ranked = sorted(numstat_rows, key=lambda r: (r[0] + r[1]), reverse=True)
-    top_files = ranked[:15]
+    shortstat, numstat_rows = stats_future.result()
+    # Rank once: the top-files list and the summary candidates share it
+    # (nlargest keeps the sorted order, so a prefix is the smaller top-N)
+    ranked_rows = heapq.nlargest(_CHURN_CANDIDATES, numstat_rows, key=_churn)
+    top_files = ranked_rows[:15]
     top_files_lines = [
         f"- {adds + dels:>4} lines changed (+{adds}/-{dels})  {path}"
         for adds, dels, path in top_files
     ] or ["(no files)"]
 
     # Cumulative diff (trimmed) and per-file chunks
-    cumulative_patch = get_cumulative_diff_patch(base_sha, anchor_sha, max_bytes=30_000)
-    file_chunks = dict(split_patch_by_file(cumulative_patch))
-
-    def _should_skip_file(path: str) -> bool:
-        p = path.lower()
-        if not p:
-            return True
-        # Skip common noisy/generated files
-        if any(x in p for x in ["/dist/", "/build/", "/.next/", "/out/"]):
-            return True
-        if any(p.endswith(ext) for ext in [".lock", ".min.js", ".map", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".webp"]):
-            return True
-        if any(name in p for name in ["node_modules/", "vendor/", "__snapshots__/"]):
-            return True
-        if any(p.endswith(name) for name in ["package-lock.json", "yarn.lock", "pnpm-lock.yaml"]):
-            return True
-        # Prefer code files; deprioritize non-code
-        code_exts = (".py", ".ts", ".tsx", ".js", ".jsx", ".go", ".rb", ".rs", ".java", ".kt", ".swift", ".c", ".cc", ".cpp", ".h", ".hpp", ".cs")
-        if not p.endswith(code_exts):
-            return True
-        return False
+    cumulative_patch = patch_future.result()
 
     # Select important files by churn and filter noise
-    selected_files: list[tuple[int, int, str]] = []
-    for adds, dels, path in ranked:
-        if _should_skip_file(path):
-            continue
-        if path not in file_chunks:
-            continue
-        selected_files.append((adds, dels, path))
-        if len(selected_files) >= 6:
-            break
-
-    # Summarize each selected file with a tiny prompt to save tokens (net-new since base)
-    per_file_summaries: list[str] = []
+    selected_files, file_chunks = _select_by_churn(numstat_rows, cumulative_patch, 6, ranked_rows)
+
+    commit_range = f"{base_sha[:12]}..{anchor_sha[:12]} (last {count} commits)"
+    # Lower bound on the final prompt size: the skeleton without base lines,
+    # the smaller frame, and each summary line with an empty summary. Once
+    # the bound overflows within the summaries that survive the 4000-char cap
+    # below, the full prompt is over budget whatever the summaries say: the
+    # compact frame is used and pruning pops that file and every later one.
+    # Those files are never sent to the provider, and `budget_cut` replays
+    # the frame choice so the final prompt is the one a full run would build.
+    min_prompt_words = _count_words(
+        _build_cohesive_prompt("", "", commit_range, subjects_bullets, [], shortstat, [])
+    ) + min(_COHESIVE_FRAME_WORDS, _COHESIVE_COMPACT_FRAME_WORDS)
+    budget_cut = False
+
+    # Summarize each selected file with a tiny prompt to save tokens (net-new since base).
+    file_jobs: list[tuple[int, int, str, str]] = []
     for adds, dels, path in selected_files:
         chunk = file_chunks.get(path, "")
         if not chunk:
             continue
+        min_prompt_words += _count_words(f"- {path} (+{adds}/-{dels}):")
+        if len(file_jobs) < _MAX_CAPPED_SUMMARIES and _tokens_for_words(min_prompt_words) > MAX_PROMPT_TOKENS:
+            budget_cut = True
+            break
         chunk = _extract_top_hunks(chunk, max_hunks=2, max_lines_per_hunk=48)
-        file_prompt = "\n".join(
-            [
-                f"Summarize changes in {path} as ONE bullet (<=25 words).",
-                "Output plain '-' bullet only; no markdown.",
-                f"Stats: +{adds}/-{dels}",
-                "Diff (trimmed):",
-                _truncate(chunk, 1200),
-            ]
+        file_prompt = f"""Summarize changes in {path} as ONE bullet (<=25 words).
+Output plain '-' bullet only; no markdown.
+Stats: +{adds}/-{dels}
+Diff (trimmed):
+{_truncate(chunk, 1200)}"""
+        file_jobs.append((adds, dels, path, file_prompt))
+
+    # The per-file and base-commit requests are independent, so they share one
+    # pool: file summaries are already in flight while base prompts are built.
+    with ThreadPoolExecutor(max_workers=max(1, MAX_PARALLEL_REQUESTS)) as ex:
+        file_futures = _submit_many(
+            ex, [job[3] for job in file_jobs], max_tokens=180, temperature=0.2, cache_sha=anchor_sha, provider=provider
         )
-        file_summary = generate_text(file_prompt, max_tokens=180, temperature=0.2)
-        if isinstance(file_summary, str) and file_summary.strip().startswith("⚠️"):
+
+        # Base commit compact summary (HEAD~N)
+        base_stats = base_stats_future.result()
+        base_selected, base_chunks = _select_by_churn(base_numstat_future.result(), base_patch_future.result(), 4)
+
+        base_jobs: list[tuple[int, int, str, str]] = []
+        for adds, dels, path in base_selected:
+            chunk = base_chunks.get(path, "")
+            if not chunk:
+                continue
+            chunk = _extract_top_hunks(chunk, max_hunks=1, max_lines_per_hunk=40)
+            base_prompt = f"""Summarize changes in base commit file {path} as ONE bullet (<=20 words).
+Output plain '-' bullet only; no markdown.
+Stats: +{adds}/-{dels}
+Diff (trimmed):
+{_truncate(chunk, 800)}"""
+            base_jobs.append((adds, dels, path, base_prompt))
+        base_futures = _submit_many(
+            ex, [job[3] for job in base_jobs], max_tokens=140, temperature=0.2, cache_sha=base_sha, provider=provider
+        )
+
+        file_responses = [f.result() for f in file_futures]
+        base_responses = [f.result() for f in base_futures]
+
+    per_file_summaries: list[str] = []
+    # Word counts kept in step with per_file_summaries for budget arithmetic
+    per_file_words: list[int] = []
+    for (adds, dels, path, _), file_summary in zip(file_jobs, file_responses):
+        if _is_warning(file_summary):
             # Fallback minimal
             file_summary = f"{path}: (+{adds}/-{dels})"
-        per_file_summaries.append(f"- {path} (+{adds}/-{dels}): {_truncate_words(_sanitize_to_plain_bullets(file_summary, max_lines=1), 50)}")
-
-    # Ensure the aggregated per-file section is not too long
-    if len("\n".join(per_file_summaries)) > 4000:
-        per_file_summaries = per_file_summaries[:4] + ["- … (more files truncated)"]
-
-    # Base commit compact summary (HEAD~N)
-    base_subject = get_commit_subject(base_sha)
-    base_stats = get_commit_stats(base_sha)
-    base_patch = get_commit_patch(base_sha, max_bytes=20_000)
-    base_chunks = dict(split_patch_by_file(base_patch))
-    base_numstat = get_commit_numstat(base_sha)
-    base_ranked = sorted(base_numstat, key=lambda r: (r[0] + r[1]), reverse=True)
-
-    base_selected: list[tuple[int, int, str]] = []
-    for adds, dels, path in base_ranked:
-        if _should_skip_file(path):
-            continue
-        if path not in base_chunks:
-            continue
-        base_selected.append((adds, dels, path))
-        if len(base_selected) >= 4:
-            break
+        summary_line = f"- {path} (+{adds}/-{dels}): {_truncate_words(_sanitize_to_plain_bullets(file_summary, max_lines=1), 50)}"
+        per_file_summaries.append(summary_line)
+        per_file_words.append(_count_words(summary_line))
+
+    # Ensure the aggregated per-file section is not too long. After a budget
+    # cut, everything this would keep beyond the remaining files is pruned
+    # anyway, so it is skipped.
+    if not budget_cut and len("\n".join(per_file_summaries)) > 4000:
+        per_file_summaries = per_file_summaries[:_MAX_CAPPED_SUMMARIES] + ["- … (more files truncated)"]
+        per_file_words = per_file_words[:_MAX_CAPPED_SUMMARIES] + [_count_words(per_file_summaries[-1])]
 
     base_file_summaries: list[str] = []
-    for adds, dels, path in base_selected:
-        chunk = base_chunks.get(path, "")
-        if not chunk:
-            continue
-        chunk = _extract_top_hunks(chunk, max_hunks=1, max_lines_per_hunk=40)
-        base_prompt = "\n".join(
-            [
-                f"Summarize changes in base commit file {path} as ONE bullet (<=20 words).",
-                "Output plain '-' bullet only; no markdown.",
-                f"Stats: +{adds}/-{dels}",
-                "Diff (trimmed):",
-                _truncate(chunk, 800),
-            ]
-        )
-        base_summary = generate_text(base_prompt, max_tokens=140, temperature=0.2)
-        if isinstance(base_summary, str) and base_summary.strip().startswith("⚠️"):
+    for (adds, dels, path, _), base_summary in zip(base_jobs, base_responses):
+        if _is_warning(base_summary):
             base_summary = f"{path}: (+{adds}/-{dels})"
         base_file_summaries.append(f"- {path} (+{adds}/-{dels}): {_truncate_words(_sanitize_to_plain_bullets(base_summary, max_lines=1), 40)}")
 
-    prompt = "\n".join(
-        [
-            "You are a senior engineer. Explain these commits as a cohesive change set.",
-            "Focus on the overarching goal, evolution across commits, and net outcomes.",
-            "",
-            "Output format requirements:",
-            "- Plain text with simple '-' bullets only",
-            "- No markdown (no bold, headers, tables, code fences)",
-            "- Be concise (<=280 words total)",
-            "",
-            f"Commit range: {base_sha[:12]}..{anchor_sha[:12]} (last {count} commits)",
-            "",
-            "Commits (oldest → newest):",
-            subjects_bullets,
-            "",
-            "Base commit (compressed view):",
-            f"- Subject: {base_subject}",
-            f"- Stats: {base_stats or '(no stats)'}",
-            *(base_file_summaries if base_file_summaries else ["(no base file summaries)"]),
-            "",
-            "Cumulative shortstat:",
-            shortstat or "(none)",
-            "",
-            "Net-new since base (top files, compressed):",
-            *(per_file_summaries if per_file_summaries else top_files_lines),
-            "",
-            "Please produce:",
-            "- TL;DR",
-            "- Key changes by theme",
-            "- Risks and potential regressions",
-            "- Tests to add or update",
-        ]
-    )
+    base_lines = [
+        f"- Subject: {base_subject}",
+        f"- Stats: {base_stats or '(no stats)'}",
+        *(base_file_summaries if base_file_summaries else ["(no base file summaries)"]),
+    ]
+
+    def _build_prompt(intro: str, outro: str, subjects_block: str, file_lines: List[str]) -> str:
+        return _build_cohesive_prompt(intro, outro, commit_range, subjects_block, base_lines, shortstat, file_lines)
+
+    # Word counts are additive across joined sections, so the budget checks
+    # below are plain arithmetic; the prompt is only joined once at the end.
+    skeleton_words = _count_words(_build_prompt("", "", "", []))
+    subjects_words = _count_words(subjects_bullets)
+    top_files_words = sum(_count_words(line) for line in top_files_lines)
+
+    def _file_words() -> int:
+        return sum(per_file_words) if per_file_summaries else top_files_words
+
+    intro, outro = _COHESIVE_INTRO, _COHESIVE_OUTRO
+    total_words = skeleton_words + _COHESIVE_FRAME_WORDS + subjects_words + _file_words()
     # Dynamic pruning to respect prompt token budget
     # If too large, drop per-file summaries from the end, then trim subjects.
-    if _estimate_tokens(prompt) > MAX_PROMPT_TOKENS:
-        pruned_new = list(per_file_summaries)
-        while pruned_new and _estimate_tokens(
-            "\n".join(
-                [
-                    "You are a senior engineer. Explain these commits as a cohesive change set (<=500 words).",
-                    "Focus on the overarching goal, how changes evolve across the set, and net outcomes.",
-                    "",
-                    f"Commit range: {base_sha[:12]}..{anchor_sha[:12]} (last {count} commits)",
-                    "",
-                    "Commits (oldest → newest):",
-                    subjects_bullets,
-                    "",
-                    "Base commit (compressed view):",
-                    f"- Subject: {base_subject}",
-                    f"- Stats: {base_stats or '(no stats)'}",
-                    *(base_file_summaries if base_file_summaries else ["(no base file summaries)"]),
-                    "",
-                    "Cumulative shortstat:",
-                    shortstat or "(none)",
-                    "",
-                    "Net-new since base (top files, compressed):",
-                    *pruned_new,
-                    "",
-                    "Please produce:",
-                    "- TL;DR (1-2 sentences)",
-                    "- Key changes by theme (bulleted)",
-                    "- Risks and potential regressions",
-                    "- Tests to add or update",
-                ]
-            )
-        ) > MAX_PROMPT_TOKENS:
-            pruned_new.pop()
-        per_file_summaries = pruned_new
-        prompt = "\n".join(
-            [
-                "You are a senior engineer. Explain these commits as a cohesive change set (<=500 words).",
-                "Focus on the overarching goal, how changes evolve across the set, and net outcomes.",
-                "",
-                f"Commit range: {base_sha[:12]}..{anchor_sha[:12]} (last {count} commits)",
-                "",
-                "Commits (oldest → newest):",
-                subjects_bullets,
-                "",
-                "Base commit (compressed view):",
-                f"- Subject: {base_subject}",
-                f"- Stats: {base_stats or '(no stats)'}",
-                *(base_file_summaries if base_file_summaries else ["(no base file summaries)"]),
-                "",
-                "Cumulative shortstat:",
-                shortstat or "(none)",
-                "",
-                "Net-new since base (top files, compressed):",
-                *(per_file_summaries if per_file_summaries else top_files_lines),
-                "",
-                "Please produce:",
-                "- TL;DR (1-2 sentences)",
-                "- Key changes by theme (bulleted)",
-                "- Risks and potential regressions",
-                "- Tests to add or update",
-            ]
-        )
-    if _estimate_tokens(prompt) > MAX_PROMPT_TOKENS:
+    if budget_cut or _tokens_for_words(total_words) > MAX_PROMPT_TOKENS:
+        intro, outro = _COHESIVE_INTRO_COMPACT, _COHESIVE_OUTRO_COMPACT
+        fixed_words = skeleton_words + _COHESIVE_COMPACT_FRAME_WORDS + subjects_words
+        pruned_words = fixed_words + sum(per_file_words)
+        while per_file_summaries and _tokens_for_words(pruned_words) > MAX_PROMPT_TOKENS:
+            pruned_words -= per_file_words.pop()
+            per_file_summaries.pop()
+        total_words = fixed_words + _file_words()
+    if _tokens_for_words(total_words) > MAX_PROMPT_TOKENS:
         # Trim subjects to first K lines
         subject_lines = subjects_bullets.splitlines()
         keep = min(8, len(subject_lines))
         subjects_bullets = "\n".join(subject_lines[:keep] + (["…"] if len(subject_lines) > keep else []))
-        prompt = "\n".join(
-            [
-                "You are a senior engineer. Explain these commits as a cohesive change set (<=500 words).",
-                "Focus on the overarching goal, how changes evolve across the set, and net outcomes.",
-                "",
-                f"Commit range: {base_sha[:12]}..{anchor_sha[:12]} (last {count} commits)",
-                "",
-                "Commits (oldest → newest):",
-                subjects_bullets,
-                "",
-                "Base commit (compressed view):",
-                f"- Subject: {base_subject}",
-                f"- Stats: {base_stats or '(no stats)'}",
-                *(base_file_summaries if base_file_summaries else ["(no base file summaries)"]),
-                "",
-                "Cumulative shortstat:",
-                shortstat or "(none)",
-                "",
-                "Net-new since base (top files, compressed):",
-                *(per_file_summaries if per_file_summaries else top_files_lines),
-                "",
-                "Please produce:",
-                "- TL;DR (1-2 sentences)",
-                "- Key changes by theme (bulleted)",
-                "- Risks and potential regressions",
-                "- Tests to add or update",
-            ]
-        )
-    # Start spinner early for cohesive flow
-    _sp2 = ui_utils.spinner("explain ", progress=True)
-    _sp2.__enter__()
-    box: str = ""
-    try:
-        response = generate_text(prompt, max_tokens=1400, temperature=0.0)
-        if isinstance(response, str) and response.strip().startswith("⚠️"):
-            prompt_no_diff = "\n".join(
-                [
-                    "Explain this cohesive set briefly as plain '-' bullets (<=220 words). No markdown.",
-                    f"Commit range: {base_sha[:12]}..{anchor_sha[:12]} (last {count} commits)",
-                    "",
-                    "Commits:",
-                    subjects_bullets,
-                    "",
-                    "Cumulative shortstat:",
-                    shortstat or "(none)",
-                    "",
-                    "Top changed files:",
-                    *top_files_lines,
-                ]
-            )
-            response = generate_text(prompt_no_diff, max_tokens=800, temperature=0.0)
-        if isinstance(response, str) and response.strip().startswith("⚠️"):
-            tldr_subjects = "; ".join(subjects[:4]) + ("; …" if len(subjects) > 4 else "")
-            lines: List[str] = []
-            lines.append(f"TL;DR: {count} commits — {tldr_subjects}")
-            lines.append("")
-            lines.append("Key changes (top files):")
-            lines.extend(top_files_lines)
-            lines.append("")
-            lines.append("Note: Cohesive LLM summary unavailable; showing top changes instead.")
-            response = "\n".join(lines)
-
-        response = _sanitize_to_plain_bullets(response, max_lines=36)
-        # Prepend a non-LLM "Changed files" section sourced from git
-        if top_files:
-            changed_files_header = f"- Changed files (top {len(top_files)}):"
-            changed_files_block = "\n".join([changed_files_header, *top_files_lines])
-        else:
-            changed_files_block = "- Changed files: (none)"
-        response = changed_files_block + "\n\n" + response
-        # Stop spinner before printing
-        box = ui_utils.format_box(
-            title="Chacha — Cohesive Commit Explanation",
-            subtitle=f"Provider: {provider}  •  Commits: {count} (range {base_sha[:12]}..{anchor_sha[:12]})",
-            content=response,
-        )
-    finally:
-        _sp2.__exit__(None, None, None)
-    if box:
-        typer.echo(box)
+    prompt = _build_prompt(intro, outro, subjects_bullets, per_file_summaries or top_files_lines)
+    response = _generate_cached(prompt, max_tokens=1400, temperature=0.0, cache_sha=anchor_sha, provider=provider)
+    if _is_warning(response):
+        top_files_block = "\n".join(top_files_lines)
+        prompt_no_diff = f"""Explain this cohesive set briefly as plain '-' bullets (<=220 words). No markdown.
+Commit range: {commit_range}
+
+Commits:
+{subjects_bullets}
+
+Cumulative shortstat:
+{shortstat or "(none)"}
+
+Top changed files:
+{top_files_block}"""
+        response = generate_text(prompt_no_diff, max_tokens=800, temperature=0.0)
+    if _is_warning(response):
+        tldr_subjects = "; ".join(subjects[:4]) + ("; …" if len(subjects) > 4 else "")
+        lines: List[str] = []
+        lines.append(f"TL;DR: {count} commits — {tldr_subjects}")
+        lines.append("")
+        lines.append("Key changes (top files):")
+        lines.extend(top_files_lines)
+        lines.append("")
+        lines.append("Note: Cohesive LLM summary unavailable; showing top changes instead.")
+        response = "\n".join(lines)
+
+    response = _sanitize_to_plain_bullets(response, max_lines=36)
+    # Prepend a non-LLM "Changed files" section sourced from git
+    if top_files:
+        changed_files_header = f"- Changed files (top {len(top_files)}):"
+        changed_files_block = "\n".join([changed_files_header, *top_files_lines])
+    else:
+        changed_files_block = "- Changed files: (none)"
+    response = changed_files_block + "\n\n" + response
+    # Prepare box (printed after the spinner stops)
+    return ui_utils.format_panel(
+        title="Chacha — Cohesive Commit Explanation",
+        subtitle=f"Provider: {provider}  •  Commits: {count} (range {base_sha[:12]}..{anchor_sha[:12]})",
+        content=response,
+    )
 
 
+def explain_commits_cohesively(anchor_spec: Optional[str], count: int, provider: str) -> None:
+    if count < 1:
+        typer.echo("❌ --cohesive N must be >= 1.", err=True)
+        raise typer.Exit(code=1)
+    if count == 1:
+        # A one-commit range is just HEAD: one request instead of per-file
+        # summaries plus a cohesive pass over them
+        explain_single_commit(anchor_spec, provider)
+        return
+    # The spinner covers git reads, per-file summaries and the final call
+    with ui_utils.spinner("explain ", progress=True):
+        box = _cohesive_box(count, provider)
+    if box:
+        typer.echo(box)
@@ -1,7 +1,10 @@
 import os
+import re
 import typer
 import questionary
 
+from chacha.utils.file_utils import write_text_atomic
+
 app = typer.Typer()
 
 
@@ -62,24 +65,22 @@ def run() -> None:
         export_line = f"export {env_var}={api_key}\n"
         
         # Check if the line already exists
-        lines = []
+        content = ""
         if os.path.exists(rc_path):
             with open(rc_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+                content = f.read()
         
         # Remove existing line for this env var if it exists
-        lines = [line for line in lines if not line.strip().startswith(f"export {env_var}=")]
+        content = re.sub(rf"^[^\S\n]*export {re.escape(env_var)}=.*(?:\n|\Z)", "", content, flags=re.MULTILINE)
         
         # Ensure file ends with newline
-        if lines and not lines[-1].endswith("\n"):
-            lines.append("\n")
+        if content and not content.endswith("\n"):
+            content += "\n"
         
         # Append new export line
-        lines.append(export_line)
+        content += export_line
         
-        # Write back to file
-        with open(rc_path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+        write_text_atomic(rc_path, content)
         
         typer.echo(f"✅ Added {env_var} to {rc_path}")
         typer.echo(f"💡 Run 'source ~/{rc_file}' or restart your terminal to apply changes.")
@@ -5,24 +5,28 @@ Includes simple PDF reading support and provider auto-detection.
 
 from __future__ import annotations
 
+import json
 import os
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Iterator, Optional
+from urllib3.util.retry import Retry
 import sys
 from datetime import datetime
 
 from chacha.utils.setup import setup_api_key
 
 try:
-    from google import genai
-except ImportError:
-    genai = None  # type: ignore
-
-try:
-    from PyPDF2 import PdfReader  # type: ignore
+    # pypdf is PyPDF2's maintained successor (same API, faster text extraction)
+    from pypdf import PdfReader  # type: ignore
 except Exception:  # pragma: no cover - optional at runtime
-    PdfReader = None  # type: ignore
+    try:
+        from PyPDF2 import PdfReader  # type: ignore
+    except Exception:
+        PdfReader = None  # type: ignore
 
 
 load_dotenv()
@@ -31,6 +35,48 @@ PROVIDER_ANTHROPIC = "anthropic"
 PROVIDER_GEMINI = "gemini"
 
 
+# Longest Retry-After (seconds) honoured before a retry
+_MAX_RETRY_AFTER = 10.0
+
+
+class _CappedRetry(Retry):
+    """Retry whose Retry-After sleep is capped, so one 429 cannot stall the CLI."""
+
+    def get_retry_after(self, response):  # type: ignore[no-untyped-def]
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, _MAX_RETRY_AFTER)
+
+
+@lru_cache(maxsize=1)
+def _http_session() -> requests.Session:
+    """Shared session so repeated calls reuse pooled keep-alive connections.
+
+    Cohesive explanations send several requests to the same host at once;
+    the pool is sized for that instead of opening a new TLS connection each time.
+    """
+    session = requests.Session()
+    # Retry failed connects and the two statuses that mean the request was
+    # rejected before running (429, 503), honouring a capped Retry-After; the
+    # last response is returned, not raised, so callers still report the
+    # status themselves. Read timeouts and 500/502/504 are never retried: the
+    # POST may already have run (and been billed) upstream.
+    retry = _CappedRetry(
+        total=2,
+        connect=2,
+        read=0,
+        backoff_factor=0.3,
+        status_forcelist=(429, 503),
+        allowed_methods=None,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+
 def _normalize_provider(value: Optional[str]) -> Optional[str]:
     if not value:
         return None
@@ -40,6 +86,9 @@ def _normalize_provider(value: Optional[str]) -> Optional[str]:
     return None
 
 
+# The environment is fixed for the life of the process, and generate_text
+# looks the provider and key up on every request (several per cohesive run).
+@lru_cache(maxsize=1)
 def get_provider() -> str:
     """Return the active provider.
 
@@ -68,6 +117,7 @@ def get_provider() -> str:
     )
 
 
+@lru_cache(maxsize=2)
 def get_api_key(provider: str) -> str:
     if provider == PROVIDER_ANTHROPIC:
         key = os.getenv("CLAUDE_API_KEY")
@@ -95,11 +145,31 @@ def get_api_key(provider: str) -> str:
     raise ValueError(f"❌ Unknown provider: {provider}")
 
 
+def get_model(provider: str) -> str:
+    """Return the model name requests to `provider` use (env override or default)."""
+    if provider == PROVIDER_ANTHROPIC:
+        return os.getenv("CHACHA_ANTHROPIC_MODEL") or "claude-3-sonnet-20240229"
+    if provider == PROVIDER_GEMINI:
+        return os.getenv("CHACHA_GEMINI_MODEL") or "gemini-2.5-flash"
+    return ""
+
+
+def reset_config_cache() -> None:
+    """Forget the cached provider, API keys and debug settings (after changing the environment)."""
+    get_provider.cache_clear()
+    get_api_key.cache_clear()
+    _is_debug_enabled.cache_clear()
+    _get_debug_file.cache_clear()
+
+
+# Checked on every request and every debug line
+@lru_cache(maxsize=1)
 def _is_debug_enabled() -> bool:
     v = (os.getenv("CHACHA_DEBUG") or "").strip().lower()
     return v in {"1", "true", "yes", "on"}
 
 
+@lru_cache(maxsize=1)
 def _get_debug_file() -> Optional[str]:
     path = (os.getenv("CHACHA_DEBUG_FILE") or "").strip()
     return path or None
@@ -123,66 +193,106 @@ def _debug_log(message: str) -> None:
         pass
 
 
+# Upper bound on file text sent for explanation (~30k tokens); reading stops
+# there instead of extracting pages or bytes that would never be used
+MAX_FILE_CHARS = int(os.getenv("CHACHA_MAX_FILE_CHARS", "120000"))
+
+
+def _cap_file_text(text: str) -> str:
+    """Cut text to MAX_FILE_CHARS, marking the cut so a partial file is not taken as whole."""
+    if len(text) <= MAX_FILE_CHARS:
+        return text
+    return text[:MAX_FILE_CHARS] + f"\n\n--- [File truncated to {MAX_FILE_CHARS} characters] ---"
+
+
+def _join_pages(page_texts: Iterator[str]) -> str:
+    """Join page texts, stopping once more than MAX_FILE_CHARS have been read."""
+    parts: list[str] = []
+    total = 0
+    for text in page_texts:
+        parts.append(text)
+        # Counts the joining newlines, so this stops once the joined text is over the cap
+        total += len(text) + 1
+        if total > MAX_FILE_CHARS + 1:
+            break
+    return _cap_file_text("\n".join(parts).strip())
+
+
 def _read_file_content(path: str) -> str:
     lower = path.lower()
+    if lower.endswith(".pdf"):
+        try:
+            # PyMuPDF (optional) extracts text in C, several times faster than
+            # the pure-Python readers; imported here so only PDF reads load it
+            import pymupdf  # type: ignore
+
+            with pymupdf.open(path) as doc:
+                return _join_pages(page.get_text("text") for page in doc)
+        except Exception:
+            # Not installed or unreadable: fall back to the pure-Python reader below
+            pass
     if lower.endswith(".pdf") and PdfReader is not None:
         try:
             reader = PdfReader(path)
-            text_parts: list[str] = []
-            for page in reader.pages:
-                text_parts.append(page.extract_text() or "")
-            return "\n".join(text_parts).strip()
+            return _join_pages(page.extract_text() or "" for page in reader.pages)
         except Exception:
             # Fall back to raw bytes decode if PDF parsing fails
             pass
     # Default: read as text
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        return f.read()
+        # One extra character tells a file that fits from one that was cut
+        return _cap_file_text(f.read(MAX_FILE_CHARS + 1))
 
 
 def explain_file(path: str) -> str:
     provider = get_provider()
     content = _read_file_content(path)
     if provider == PROVIDER_ANTHROPIC:
-        return _explain_with_anthropic(content)
+        # Shared request path, so CHACHA_ANTHROPIC_MODEL applies here too
+        return generate_text(f"Explain this code:\n\n{content}", max_tokens=2000)
     if provider == PROVIDER_GEMINI:
         return _explain_with_gemini(content)
     return "⚠️ Unsupported provider."
 
 
-def _explain_with_anthropic(content: str) -> str:
-    api_key = get_api_key(PROVIDER_ANTHROPIC)
-    response = requests.post(
-        "https://api.anthropic.com/v1/messages",
-        headers={
-            "x-api-key": api_key,
-            "content-type": "application/json",
-        },
-        json={
-            "model": "claude-3-sonnet-20240229",
-            "max_tokens": 2000,
-            "messages": [
-                {"role": "user", "content": f"Explain this code:\n\n{content}"}
-            ],
-        },
-        timeout=60,
-    )
-    data = response.json()
-    if isinstance(data, dict) and data.get("content"):
-        first = data["content"][0]
-        if isinstance(first, dict) and "text" in first:
-            return first["text"]
-    return "⚠️ No explanation received from Anthropic."
+def explain_files(paths: list[str], max_workers: int = 6) -> list[str]:
+    """Explain several files concurrently; results keep the order of `paths`.
+
+    Each request mostly waits on the network, so a small thread pool over the
+    shared session overlaps them instead of paying one round trip per file.
+    """
+    if len(paths) <= 1:
+        return [explain_file(path) for path in paths]
+    # Resolve credentials on this thread so a missing key prompts only once
+    get_api_key(get_provider())
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths)))) as ex:
+        return list(ex.map(explain_file, paths))
+
+
+# The API key goes in the x-goog-api-key header, never the URL, so it cannot
+# leak into debug logs or proxy access logs
+_GEMINI_URL_TEMPLATE = "https://generativelanguage.googleapis.com/{version}/models/{model}:generateContent"
+
+
+def _gemini_http_error(response: requests.Response) -> str:
+    """Describe a non-200 Gemini response, preferring the API's own error message."""
+    fallback = f"⚠️ Gemini HTTP {response.status_code}: {response.text[:500]}"
+    try:
+        err = response.json()
+    except ValueError:
+        return fallback
+    error = err.get("error") if isinstance(err, dict) else None
+    if not isinstance(error, dict):
+        return fallback
+    msg = error.get("message") or str(err)[:500]
+    return f"⚠️ Gemini error ({response.status_code}): {msg}"
 
 
 def _explain_with_gemini(content: str) -> str:
     api_key = get_api_key(PROVIDER_GEMINI)
-    model = os.getenv("CHACHA_GEMINI_MODEL") or "gemini-2.5-flash"
+    model = get_model(PROVIDER_GEMINI)
     api_version = os.getenv("CHACHA_GEMINI_API_VERSION") or "v1"
-    url = (
-        f"https://generativelanguage.googleapis.com/{api_version}/models/"
-        f"{model}:generateContent?key={api_key}"
-    )
+    url = _GEMINI_URL_TEMPLATE.format(version=api_version, model=model)
     payload = {
         "contents": [
             {"role": "user", "parts": [{"text": f"Explain this code:\n\n{content}"}]}
@@ -192,31 +302,25 @@ def _explain_with_gemini(content: str) -> str:
             "maxOutputTokens": 2000,
         },
     }
-    response = requests.post(
+    response = _http_session().post(
         url,
         json=payload,
         headers={
             "Content-Type": "application/json",
+            "x-goog-api-key": api_key,
         },
         timeout=60,
     )
 
     # Non-200 → surface server error message
     if response.status_code != 200:
-        try:
-            err = response.json()
-            if isinstance(err, dict) and "error" in err:
-                msg = err.get("error", {}).get("message") or str(err)
-                return f"⚠️ Gemini error ({response.status_code}): {msg}"
-            return f"⚠️ Gemini HTTP {response.status_code}: {response.text[:500]}"
-        except Exception:
-            return f"⚠️ Gemini HTTP {response.status_code}: {response.text[:500]}"
+        return _gemini_http_error(response)
 
     data = response.json()
 
     # API-level error envelope
     if isinstance(data, dict) and "error" in data:
-        msg = data.get("error", {}).get("message") or str(data)
+        msg = data.get("error", {}).get("message") or str(data)[:500]
         return f"⚠️ Gemini error: {msg}"
 
     # Safety/prompt feedback
@@ -252,7 +356,7 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
     provider = get_provider()
     if provider == PROVIDER_ANTHROPIC:
         api_key = get_api_key(PROVIDER_ANTHROPIC)
-        model = os.getenv("CHACHA_ANTHROPIC_MODEL") or "claude-3-sonnet-20240229"
+        model = get_model(PROVIDER_ANTHROPIC)
         if _is_debug_enabled():
             _debug_log(
                 "Anthropic request:"
@@ -262,7 +366,7 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
                 f"\n- prompt_len_chars={len(prompt)}"
                 f"\n- prompt_preview={prompt[:1000]}"
             )
-        response = requests.post(
+        response = _http_session().post(
             "https://api.anthropic.com/v1/messages",
             headers={
                 "x-api-key": api_key,
@@ -281,6 +385,8 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
                 _debug_log(f"Anthropic response: status={response.status_code} body_preview={response.text[:1200]}")
             except Exception:
                 _debug_log("Anthropic response: <unavailable for debug>")
+        if not response.ok:
+            return f"⚠️ Anthropic API error ({response.status_code}): {response.text[:200]}"
         data = response.json()
         if isinstance(data, dict) and data.get("content"):
             first = data["content"][0]
@@ -291,12 +397,9 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
 
     if provider == PROVIDER_GEMINI:
         api_key = get_api_key(PROVIDER_GEMINI)
-        model = os.getenv("CHACHA_GEMINI_MODEL") or "gemini-2.5-flash"
+        model = get_model(PROVIDER_GEMINI)
         api_version = os.getenv("CHACHA_GEMINI_API_VERSION") or "v1"
-        url = (
-            f"https://generativelanguage.googleapis.com/{api_version}/models/"
-            f"{model}:generateContent?key={api_key}"
-        )
+        url = _GEMINI_URL_TEMPLATE.format(version=api_version, model=model)
         # Optional safety settings override (default: allow all to avoid spurious blocks on diffs)
         safety_env = (os.getenv("CHACHA_GEMINI_SAFETY") or "off").strip().lower()
         safety_settings = None
@@ -310,7 +413,7 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
         if _is_debug_enabled():
             _debug_log(
                 "Gemini request:"
-                f"\n- url={url.split('?')[0]}"
+                f"\n- url={url}"
                 f"\n- model={model}"
                 f"\n- max_tokens={max_tokens}"
                 f"\n- temperature={temperature}"
@@ -328,10 +431,10 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
         if safety_settings is not None:
             base_payload["safetySettings"] = safety_settings  # type: ignore[assignment]
         payload = base_payload
-        response = requests.post(
+        response = _http_session().post(
             url,
             json=payload,
-            headers={"Content-Type": "application/json"},
+            headers={"Content-Type": "application/json", "x-goog-api-key": api_key},
             timeout=60,
         )
         if _is_debug_enabled():
@@ -340,14 +443,7 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
             except Exception:
                 _debug_log("Gemini response: <unavailable for debug>")
         if response.status_code != 200:
-            try:
-                err = response.json()
-                if isinstance(err, dict) and "error" in err:
-                    msg = err.get("error", {}).get("message") or str(err)
-                    return f"⚠️ Gemini error ({response.status_code}): {msg}"
-                return f"⚠️ Gemini HTTP {response.status_code}: {response.text[:500]}"
-            except Exception:
-                return f"⚠️ Gemini HTTP {response.status_code}: {response.text[:500]}"
+            return _gemini_http_error(response)
         data = response.json()
         if isinstance(data, dict):
             # Surface prompt-level feedback blocks early
@@ -402,10 +498,10 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
                             retry_payload["safetySettings"] = safety_settings  # type: ignore[assignment]
                         if _is_debug_enabled():
                             _debug_log(f"Gemini retry due to MAX_TOKENS with maxOutputTokens={retry_tokens}")
-                        retry_resp = requests.post(
+                        retry_resp = _http_session().post(
                             url,
                             json=retry_payload,
-                            headers={"Content-Type": "application/json"},
+                            headers={"Content-Type": "application/json", "x-goog-api-key": api_key},
                             timeout=60,
                         )
                         try:
@@ -427,6 +523,91 @@ def generate_text(prompt: str, *, max_tokens: int = 2000, temperature: float = 0
     return "⚠️ Unsupported provider."
 
 
+_ANTHROPIC_BATCHES_URL = "https://api.anthropic.com/v1/messages/batches"
+
+
+def generate_texts_batch(
+    prompts: list[str],
+    *,
+    max_tokens: int = 2000,
+    temperature: float = 0.2,
+    poll_interval: float = 10.0,
+    timeout: float = 3600.0,
+) -> list[str]:
+    """Send prompts as one Anthropic Message Batch and wait for the results.
+
+    Batches cost half as much as regular requests but usually take minutes to
+    finish, so this is meant for work that is not latency-sensitive. Responses
+    come back in prompt order; a request that did not succeed yields a warning
+    string, as with generate_text.
+    """
+    if not prompts:
+        return []
+    if get_provider() != PROVIDER_ANTHROPIC:
+        return ["⚠️ Batch requests are only supported for Anthropic."] * len(prompts)
+    api_key = get_api_key(PROVIDER_ANTHROPIC)
+    model = get_model(PROVIDER_ANTHROPIC)
+    headers = {
+        "x-api-key": api_key,
+        "anthropic-version": "2023-06-01",
+        "content-type": "application/json",
+    }
+    body = {
+        "requests": [
+            {
+                "custom_id": f"req-{i}",
+                "params": {
+                    "model": model,
+                    "max_tokens": max_tokens,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": temperature,
+                },
+            }
+            for i, prompt in enumerate(prompts)
+        ]
+    }
+    texts = ["⚠️ No response from Anthropic."] * len(prompts)
+    session = _http_session()
+    try:
+        response = session.post(_ANTHROPIC_BATCHES_URL, headers=headers, json=body, timeout=60)
+        batch = response.json()
+        batch_id = batch.get("id") if isinstance(batch, dict) else None
+        if not batch_id:
+            return [f"⚠️ Anthropic batch error ({response.status_code}): {response.text[:200]}"] * len(prompts)
+        _debug_log(f"Anthropic batch submitted: id={batch_id} requests={len(prompts)}")
+        deadline = time.monotonic() + timeout
+        while batch.get("processing_status") != "ended":
+            if time.monotonic() > deadline:
+                session.post(f"{_ANTHROPIC_BATCHES_URL}/{batch_id}/cancel", headers=headers, timeout=60)
+                return ["⚠️ Anthropic batch timed out."] * len(prompts)
+            time.sleep(poll_interval)
+            batch = session.get(f"{_ANTHROPIC_BATCHES_URL}/{batch_id}", headers=headers, timeout=60).json()
+        _debug_log(f"Anthropic batch ended: id={batch_id} counts={batch.get('request_counts')}")
+        results = session.get(batch["results_url"], headers=headers, timeout=60)
+    except (requests.RequestException, ValueError, KeyError, AttributeError):
+        return texts
+
+    # Results are JSONL in arbitrary order; custom_id maps them back
+    for line in results.text.splitlines():
+        try:
+            item = json.loads(line)
+            index = int(str(item["custom_id"]).rsplit("-", 1)[1])
+            result = item["result"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            continue
+        if not 0 <= index < len(texts) or not isinstance(result, dict):
+            continue
+        if result.get("type") != "succeeded":
+            texts[index] = f"⚠️ Anthropic batch request {result.get('type') or 'failed'}."
+            continue
+        content = (result.get("message") or {}).get("content")
+        if isinstance(content, list) and content:
+            first = content[0]
+            if isinstance(first, dict) and "text" in first:
+                texts[index] = first["text"]
+    return texts
+
+
 def generate_commit_message(diff: str, staged_files: list[str] | None = None) -> str:
     """Generate a commit message from git diff using AI. PLEASE ONLY RETURN THE COMMIT MESSAGE, NO EXTRA TEXT OR EXPLANATION.
     
@@ -460,73 +641,9 @@ Rules:
 - Use imperative mood ("Add feature" not "Added feature")
 - Only return the commit message, no extra text or explanation"""
 
-    if provider == PROVIDER_ANTHROPIC:
-        return _generate_commit_with_anthropic(prompt)
-    if provider == PROVIDER_GEMINI:
-        return _generate_commit_with_gemini(prompt)
-    return "⚠️ Unsupported provider."
-
-
-def _generate_commit_with_anthropic(prompt: str) -> str:
-    """Generate commit message using Anthropic Claude."""
-    api_key = get_api_key(PROVIDER_ANTHROPIC)
-    response = requests.post(
-        "https://api.anthropic.com/v1/messages",
-        headers={
-            "x-api-key": api_key,
-            "content-type": "application/json",
-        },
-        json={
-            "model": "claude-3-sonnet-20240229",
-            "max_tokens": 200,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-        },
-        timeout=60,
-    )
-    
-    if not response.ok:
-        return f"⚠️ API error ({response.status_code}): {response.text[:200]}"
-    
-    data = response.json()
-    if isinstance(data, dict) and data.get("content"):
-        first = data["content"][0]
-        if isinstance(first, dict) and "text" in first:
-            return first["text"].strip()
-    return "⚠️ No commit message received from Anthropic."
-
-
-def _generate_commit_with_gemini(prompt: str) -> str:
-    """Generate commit message using Google Gemini."""
-    if genai is None:
-        return "⚠️ google-genai package not installed. Run: pip install google-genai"
-    
-    # Ensure API key is set in environment for the SDK
-    api_key = get_api_key(PROVIDER_GEMINI)
-    # The SDK reads from GEMINI_API_KEY or GOOGLE_API_KEY env var
-    if not os.getenv("GEMINI_API_KEY") and not os.getenv("GOOGLE_API_KEY"):
-        os.environ["GEMINI_API_KEY"] = api_key
-    
-    try:
-        # The client gets the API key from the environment variable
-        client = genai.Client()
-        
-        # Get model from env or use default
-        model = os.getenv("CHACHA_GEMINI_MODEL") or "gemini-2.0-flash"
-        
-        response = client.models.generate_content(
-            model=model,
-            contents=prompt
-        )
-        
-        if response and hasattr(response, 'text') and response.text:
-            return response.text.strip()
-        
-        return "⚠️ No commit message received from Gemini."
-    except Exception as e:
-        error_msg = str(e)
-        if hasattr(e, 'message'):
-            error_msg = e.message
-        return f"⚠️ Gemini error: {error_msg}"
-
+    if provider not in (PROVIDER_ANTHROPIC, PROVIDER_GEMINI):
+        return "⚠️ Unsupported provider."
+    # Same REST path, model settings and pooled session as every other call;
+    # Gemini gets room for the thinking tokens 2.5 models spend first
+    max_tokens = 1024 if provider == PROVIDER_GEMINI else 200
+    return generate_text(prompt, max_tokens=max_tokens, temperature=0.2).strip()
@@ -0,0 +1,60 @@
+"""On-disk cache for AI explanations.
+
+Entries are keyed by commit SHA plus a hash of the provider, model and prompt,
+so a changed prompt template (or provider, or model) never returns a stale
+answer. Files are
+sharded into subdirectories by SHA prefix so a large history (one entry per
+file summary) does not pile up in a single directory. Set CHACHA_NO_CACHE=1
+to bypass the cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+def _cache_dir() -> Path:
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "chacha" / "explain"
+
+
+def _is_disabled() -> bool:
+    v = (os.getenv("CHACHA_NO_CACHE") or "").strip().lower()
+    return v in {"1", "true", "yes", "on"}
+
+
+def _entry_path(sha: str, prompt: str, provider: str = "", model: str = "") -> Path:
+    return _cache_dir() / sha[:2] / cache_key(sha, prompt, provider, model)
+
+
+def cache_key(sha: str, prompt: str, provider: str = "", model: str = "") -> str:
+    digest = hashlib.blake2b(f"{provider}\0{model}\0{prompt}".encode("utf-8"), digest_size=8).hexdigest()
+    return f"{sha[:12]}-{digest}"
+
+
+def get(sha: str, prompt: str, provider: str = "", model: str = "") -> Optional[str]:
+    """Return the cached response, or None on a miss."""
+    if _is_disabled() or not sha:
+        return None
+    try:
+        return _entry_path(sha, prompt, provider, model).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def put(sha: str, prompt: str, response: str, provider: str = "", model: str = "") -> None:
+    """Store a response; failures are ignored (the cache is best-effort)."""
+    if _is_disabled() or not sha or not response:
+        return
+    try:
+        path = _entry_path(sha, prompt, provider, model)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+        tmp.write_text(response, encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
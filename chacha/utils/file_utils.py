@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import os
+import shutil
 from pathlib import Path
 from typing import Iterable
 
@@ -19,6 +21,21 @@ def write_text(path: str | Path, content: str) -> None:
     p.write_text(content, encoding="utf-8")
 
 
+def write_text_atomic(path: str | Path, content: str) -> None:
+    """Replace a file's contents so a crash never leaves it half-written.
+
+    Symlinks are resolved first so a linked dotfile keeps its link, and an
+    existing file keeps its permission bits.
+    """
+    target = os.path.realpath(path)
+    tmp_path = f"{target}.chacha-tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    if os.path.exists(target):
+        shutil.copymode(target, tmp_path)
+    os.replace(tmp_path, target)
+
+
 def list_files(root: str | Path, patterns: Iterable[str] | None = None) -> list[Path]:
     p = Path(root)
     if not p.exists():
@@ -2,71 +2,138 @@
 
 from __future__ import annotations
 
+import os
+import re
+import shutil
 import subprocess
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 
-def _run_git(args: List[str]) -> str:
-    result = subprocess.run(["git", *args], capture_output=True, text=True)
+@lru_cache(maxsize=1)
+def _git_executable() -> str:
+    return shutil.which("git") or "git"
+
+
+# An absolute executable path plus close_fds=False lets CPython start git with
+# posix_spawn instead of fork+exec. Descriptors Python opens are
+# non-inheritable by default (PEP 446), so nothing extra leaks into git.
+_SPAWN_OPTIONS = {"close_fds": False}
+
+
+def _git_argv(args: List[str]) -> list[str]:
+    return [_git_executable(), *args]
+
+
+def _run_git(args: List[str], strip: bool = True) -> str:
+    # Bytes plus one explicit UTF-8 decode: no locale-dependent text wrapper,
+    # and stray non-UTF-8 bytes in paths or messages cannot raise
+    result = subprocess.run(
+        _git_argv(args), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, **_SPAWN_OPTIONS
+    )
     if result.returncode != 0:
         return ""
-    return result.stdout.strip()
+    out = result.stdout.decode("utf-8", errors="replace")
+    return out.strip() if strip else out
+
+
+def _run_git_capped(args: List[str], max_bytes: int) -> tuple[str, bool]:
+    """Run git reading at most `max_bytes` of stdout; returns (text, truncated).
+
+    When the output is larger, git is stopped early instead of letting it
+    compute and write the rest of a huge diff.
+    """
+    try:
+        proc = subprocess.Popen(_git_argv(args), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, **_SPAWN_OPTIONS)
+    except OSError:
+        return "", False
+    with proc:
+        data = proc.stdout.read(max_bytes + 1) if proc.stdout else b""
+        truncated = len(data) > max_bytes
+        if truncated:
+            proc.kill()
+        returncode = proc.wait()
+    if returncode != 0 and not truncated:
+        return "", False
+    return data[:max_bytes].decode("utf-8", errors="replace"), truncated
+
+
+def _exclude_pathspecs(exclude: Sequence[str]) -> list[str]:
+    if not exclude:
+        return []
+    return ["--", *(f":(exclude){pattern}" for pattern in exclude)]
+
+
+# One `status --porcelain` entry: "XY name", or "XY old -> new" for renames
+# and copies. Names with spaces or special characters are C-quoted, so an
+# unquoted name never contains " -> ".
+_PORCELAIN_RE = re.compile(r'^.. (?:(?:"(?:[^"\\]|\\.)*"|[^"\s]\S*) -> )?(.+)$', re.MULTILINE)
 
 
 def get_changed_files() -> list[str]:
-    out = _run_git(["status", "--porcelain"])
-    files: list[str] = []
-    for line in out.splitlines():
-        if not line:
-            continue
-        # format: "XY filename"
-        parts = line.split(maxsplit=1)
-        if len(parts) == 2:
-            files.append(parts[1])
-    return files
+    # Unstripped: the status column of the first line may be a space
+    out = _run_git(["status", "--porcelain"], strip=False)
+    # Renamed/copied entries are reported under their new path
+    return _PORCELAIN_RE.findall(out)
 
 
 def get_last_commit_message() -> str:
     return _run_git(["log", "-1", "--pretty=%B"]) or ""
 
 
-def _is_negative_int(text: str) -> bool:
-    try:
-        return int(text) < 0
-    except Exception:
-        return False
+_NEGATIVE_INDEX_RE = re.compile(r"-(\d+)")
 
 
 def _negative_index_to_rev(text: str) -> Optional[str]:
-    """Map '-1' -> 'HEAD', '-2' -> 'HEAD~1', '-3' -> 'HEAD~2', etc."""
-    try:
-        n = int(text)
-    except Exception:
-        return None
-    if n >= 0:
+    """Map '-1' -> 'HEAD', '-2' -> 'HEAD~1', '-3' -> 'HEAD~2', etc.; None if not a negative index."""
+    m = _NEGATIVE_INDEX_RE.fullmatch(text)
+    k = int(m.group(1)) if m else 0
+    if k == 0:
         return None
-    k = abs(n)
     if k == 1:
         return "HEAD"
     return f"HEAD~{k-1}"
 
 
+# `git rev-parse` echoes a full lowercase SHA back without looking it up
+_FULL_SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+
+@lru_cache(maxsize=128)
 def resolve_commit_sha(spec: str) -> Optional[str]:
     """Resolve a commit spec (hash/ref or negative index) to a full SHA."""
     spec = (spec or "").strip()
+    if _FULL_SHA_RE.fullmatch(spec):
+        return spec
     if not spec:
         spec = "-1"
-    if _is_negative_int(spec):
-        rev = _negative_index_to_rev(spec)
-        if not rev:
-            return None
-        sha = _run_git(["rev-parse", rev])
-        return sha or None
-    # Assume it's a hash or ref
-    sha = _run_git(["rev-parse", spec])
+    # Negative indexes count back from HEAD; anything else is a hash or ref
+    rev = _negative_index_to_rev(spec) or spec
+    sha = _run_git(["rev-parse", rev])
     return sha or None
 
 
+def resolve_commit_shas(specs: Sequence[str]) -> list[Optional[str]]:
+    """Resolve several commit specs with one `git rev-parse`; None for any that fail.
+
+    Accepts the same specs as resolve_commit_sha. If any ref does not
+    resolve, git rejects the whole call, so fall back to resolving them one
+    by one.
+    """
+    specs = [(spec or "").strip() or "-1" for spec in specs]
+    # Full SHAs need no lookup; negative indexes are rewritten locally
+    pending = [spec for spec in specs if not _FULL_SHA_RE.fullmatch(spec)]
+    if not pending:
+        return list(specs)
+    out = _run_git(["rev-parse", *(_negative_index_to_rev(spec) or spec for spec in pending)])
+    shas = out.splitlines()
+    if len(shas) != len(pending):
+        return [resolve_commit_sha(spec) for spec in specs]
+    resolved = dict(zip(pending, shas))
+    return [resolved.get(spec, spec) for spec in specs]
+
+
 def rev_list(anchor: str, count: int) -> list[str]:
     """Return up to 'count' SHAs reachable from 'anchor' (newest first)."""
     if count <= 0:
@@ -75,21 +142,94 @@ def rev_list(anchor: str, count: int) -> list[str]:
     return [line for line in out.splitlines() if line]
 
 
+def rev_list_with_subjects(anchor: str, count: int) -> list[tuple[str, str]]:
+    """Return up to 'count' (sha, subject) pairs reachable from 'anchor' (newest first).
+
+    Same walk as rev_list, but subjects come from the same `git log` call.
+    """
+    if count <= 0:
+        return []
+    out = _run_git(["log", "--max-count", str(count), "--format=%H%x1f%s", anchor], strip=False)
+    pairs: list[tuple[str, str]] = []
+    for line in out.splitlines():
+        sha, sep, subject = line.partition("\x1f")
+        if sep:
+            pairs.append((sha, subject.strip()))
+    return pairs
+
+
+_COMMIT_RECORD_FIELDS = ("subject", "author", "date", "parents", "body")
+
+
+# Commit objects are immutable, so each one is read once and memoized; the
+# per-field accessors below all share that record. It also accepts symbolic
+# refs, hence the reset in _invalidate_index_caches.
+@lru_cache(maxsize=1024)
+def _commit_record(sha: str) -> dict[str, str]:
+    # Fields separated by 0x1f; the body goes last since it spans lines
+    out = _run_git(
+        ["show", "-s", "--date=iso-strict-local", "--format=%s%x1f%an <%ae>%x1f%ad%x1f%P%x1f%b", sha],
+        strip=False,
+    )
+    fields = out.split("\x1f", len(_COMMIT_RECORD_FIELDS) - 1)
+    if len(fields) != len(_COMMIT_RECORD_FIELDS):
+        return dict.fromkeys(_COMMIT_RECORD_FIELDS, "")
+    return {key: value.strip() for key, value in zip(_COMMIT_RECORD_FIELDS, fields)}
+
+
 def get_commit_subject(sha: str) -> str:
-    return _run_git(["show", "-s", "--pretty=%s", sha]) or ""
+    return _commit_record(sha)["subject"]
 
 
 def get_commit_author(sha: str) -> str:
-    return _run_git(["show", "-s", "--pretty=%an <%ae>", sha]) or ""
+    return _commit_record(sha)["author"]
 
 
 def get_commit_date(sha: str) -> str:
     # --date=iso-strict-local gives readable local time
-    return _run_git(["show", "-s", "--date=iso-strict-local", "--pretty=%ad", sha]) or ""
+    return _commit_record(sha)["date"]
 
 
 def get_commit_body(sha: str) -> str:
-    return _run_git(["show", "-s", "--pretty=%b", sha]) or ""
+    return _commit_record(sha)["body"]
+
+
+_COMMIT_META_FIELDS = ("sha", "subject", "author", "date", "body")
+
+
+def get_commit_meta_bulk(shas: list[str]) -> list[dict[str, str]]:
+    """Return sha/subject/author/date/body for each SHA with a single `git log` call.
+
+    Results follow the input order; unknown SHAs yield empty fields.
+    """
+    if not shas:
+        return []
+    # Fields separated by 0x1f, records by 0x1e (neither appears in commit text)
+    out = _run_git(
+        [
+            "log",
+            "--no-walk=unsorted",
+            "--date=iso-strict-local",
+            "--format=%H%x1f%s%x1f%an <%ae>%x1f%ad%x1f%b%x1e",
+            *shas,
+        ],
+        # str.strip() treats 0x1e/0x1f as whitespace, so keep the raw output
+        strip=False,
+    )
+    by_sha: dict[str, dict[str, str]] = {}
+    for record in out.split("\x1e"):
+        fields = record.lstrip("\n").split("\x1f")
+        if len(fields) != len(_COMMIT_META_FIELDS):
+            continue
+        meta = {key: value.strip() for key, value in zip(_COMMIT_META_FIELDS, fields)}
+        by_sha[meta["sha"]] = meta
+    empty = dict.fromkeys(_COMMIT_META_FIELDS, "")
+    return [by_sha.get(sha) or {**empty, "sha": sha} for sha in shas]
+
+
+def get_commit_meta(sha: str) -> dict[str, str]:
+    """Return sha/subject/author/date/body for a single commit."""
+    return get_commit_meta_bulk([sha])[0]
 
 
 def get_commit_files_changed(sha: str) -> list[str]:
@@ -101,69 +241,84 @@ def get_commit_files_changed(sha: str) -> list[str]:
     return files
 
 
+@lru_cache(maxsize=1024)
 def get_commit_stats(sha: str) -> str:
     # Summary statistics (files changed, insertions, deletions)
     stat = _run_git(["show", "--stat", "--oneline", sha])
     return stat or ""
 
 def get_commit_numstat(sha: str) -> list[tuple[int, int, str]]:
-    """Return per-file added/deleted counts for a single commit."""
-    out = _run_git(["show", "--numstat", "--pretty=format:", sha])
-    rows: list[tuple[int, int, str]] = []
-    for line in out.splitlines():
-        parts = line.split("\t")
-        if len(parts) != 3:
-            continue
-        adds_s, dels_s, path = parts
-        try:
-            adds = int(adds_s) if adds_s.isdigit() else 0
-        except Exception:
-            adds = 0
-        try:
-            dels = int(dels_s) if dels_s.isdigit() else 0
-        except Exception:
-            dels = 0
-        rows.append((adds, dels, path))
-    return rows
+    """Return per-file added/deleted counts for a single commit.
 
-def get_commit_patch(sha: str, max_bytes: int = 200_000) -> str:
-    """Return unified diff patch for a commit; truncate if too large."""
-    patch = _run_git(["show", "--format=format:", "--patch", sha])
-    if not patch:
-        return ""
-    if len(patch) > max_bytes:
-        head = patch[: max_bytes - 200]
-        tail_note = f"\n\n--- [Diff truncated to {max_bytes} bytes] ---"
-        return head + tail_note
-    return patch
+    Renamed/copied files are reported under their new path.
+    """
+    out = _run_git(["show", "-z", "--numstat", "--pretty=format:", sha], strip=False)
+    return _parse_numstat_z(out)[1]
+
+def get_commit_patch(sha: str, max_bytes: int = 200_000, exclude: Sequence[str] = ()) -> str:
+    """Return unified diff patch for a commit; truncate if too large.
+
+    `exclude` takes pathspec patterns (e.g. "*.lock") that git should skip.
+    Results are memoized per (sha, max_bytes, exclude).
+    """
+    return _commit_patch(sha, max_bytes, tuple(exclude))
+
+
+# Patches can be large, so only a few are kept; the tuple keeps `exclude` hashable
+@lru_cache(maxsize=16)
+def _commit_patch(sha: str, max_bytes: int, exclude: Tuple[str, ...]) -> str:
+    patch, truncated = _run_git_capped(
+        ["show", "--no-color", "--format=format:", "--patch", sha, *_exclude_pathspecs(exclude)],
+        max_bytes,
+    )
+    if not truncated:
+        return patch.strip()
+    head = patch.lstrip()[: max_bytes - 200]
+    tail_note = f"\n\n--- [Diff truncated to {max_bytes} bytes] ---"
+    return head + tail_note
 
 
 def get_commit_parents(sha: str) -> list[str]:
     """Return parent SHAs for a commit (may be empty for root)."""
-    out = _run_git(["show", "-s", "--pretty=%P", sha])
-    parts = (out or "").split()
-    return [p for p in parts if p]
+    return _commit_record(sha)["parents"].split()
 
 
+# Well-known SHA-1 of the empty tree object (constant for every SHA-1 repository)
+EMPTY_TREE_SHA = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+# Its counterpart in repositories using the SHA-256 object format
+EMPTY_TREE_SHA256 = "6ef19b41225c5369f1c104d45d8d85efa9b057b53b14b4b9b939dd74decc5321"
+
+
+@lru_cache(maxsize=1)
 def get_empty_tree_sha() -> str:
-    """Return the SHA of the empty tree object."""
-    sha = _run_git(["hash-object", "-t", "tree", "/dev/null"])
-    # Fallback to the well-known empty tree SHA if command fails
-    return sha or "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+    """Return the SHA of the empty tree object for the current repository."""
+    if _run_git(["rev-parse", "--show-object-format"]) == "sha256":
+        return EMPTY_TREE_SHA256
+    return EMPTY_TREE_SHA
 
 
-def get_cumulative_diff_patch(base: str, anchor: str, max_bytes: int = 120_000) -> str:
-    """Return unified diff for the range base..anchor with rename/copy detection."""
-    patch = _run_git(
-        ["diff", "--patch", "--find-renames", "--find-copies", f"{base}..{anchor}"]
+def get_cumulative_diff_patch(base: str, anchor: str, max_bytes: int = 120_000, exclude: Sequence[str] = ()) -> str:
+    """Return unified diff for the range base..anchor with rename/copy detection.
+
+    `exclude` takes pathspec patterns (e.g. "*.lock") that git should skip.
+    """
+    patch, truncated = _run_git_capped(
+        [
+            "diff",
+            "--no-color",
+            "--patch",
+            "--find-renames",
+            "--find-copies",
+            f"{base}..{anchor}",
+            *_exclude_pathspecs(exclude),
+        ],
+        max_bytes,
     )
-    if not patch:
-        return ""
-    if len(patch) > max_bytes:
-        head = patch[: max_bytes - 200]
-        tail_note = f"\n\n--- [Cumulative diff truncated to {max_bytes} bytes] ---"
-        return head + tail_note
-    return patch
+    if not truncated:
+        return patch.strip()
+    head = patch.lstrip()[: max_bytes - 200]
+    tail_note = f"\n\n--- [Cumulative diff truncated to {max_bytes} bytes] ---"
+    return head + tail_note
 
 
 def get_cumulative_diff_shortstat(base: str, anchor: str) -> str:
@@ -173,68 +328,140 @@ def get_cumulative_diff_shortstat(base: str, anchor: str) -> str:
 
 def get_cumulative_diff_numstat(base: str, anchor: str) -> list[tuple[int, int, str]]:
     """Return per-file added/deleted counts for base..anchor."""
-    out = _run_git(["diff", "--numstat", f"{base}..{anchor}"])
+    out = _run_git(["diff", "-z", "--numstat", f"{base}..{anchor}"], strip=False)
+    return _parse_numstat_z(out)[1]
+
+
+# One -z numstat row: counts ("-" for binary files) and the path; a rename or
+# copy has an empty path field followed by the old and new paths
+_NUMSTAT_Z_RE = re.compile(r"(\d+|-)\t(\d+|-)\t(?:\0[^\0]*\0)?([^\0]*)\0")
+
+
+def _parse_numstat_z(out: str) -> tuple[str, list[tuple[int, int, str]]]:
+    """Parse `git diff -z --numstat` output into (trailer, rows).
+
+    The trailer is whatever non-numstat text follows the rows (a --shortstat
+    or --stat block), returned unstripped. Renamed/copied files are reported
+    under their new path.
+    """
     rows: list[tuple[int, int, str]] = []
-    for line in out.splitlines():
-        parts = line.split("\t")
-        if len(parts) != 3:
-            continue
-        adds_s, dels_s, path = parts
-        try:
-            adds = int(adds_s) if adds_s.isdigit() else 0
-        except Exception:
-            adds = 0
-        try:
-            dels = int(dels_s) if dels_s.isdigit() else 0
-        except Exception:
-            dels = 0
+    end = 0
+    for m in _NUMSTAT_Z_RE.finditer(out):
+        adds_s, dels_s, path = m.groups()
+        adds = int(adds_s) if adds_s != "-" else 0
+        dels = int(dels_s) if dels_s != "-" else 0
         rows.append((adds, dels, path))
-    return rows
+        end = m.end()
+    # The trailing stat block is the only text after the last row
+    trailer = out[end:]
+    return trailer, rows
 
 
-def split_patch_by_file(patch: str) -> list[tuple[str, str]]:
-    """Split a unified diff into (path, chunk) pairs using 'diff --git a/ b/' markers."""
-    if not patch:
-        return []
-    results: list[tuple[str, str]] = []
-    current_lines: list[str] = []
-    current_path: str = ""
-    for line in patch.splitlines():
-        if line.startswith("diff --git "):
-            # Flush previous
-            if current_lines and current_path:
-                results.append((current_path, "\n".join(current_lines)))
-            # Parse path
-            parts = line.strip().split()
-            # Format: diff --git a/path b/path
-            if len(parts) >= 4 and parts[-2].startswith("a/") and parts[-1].startswith("b/"):
-                path_a = parts[-2][2:]
-                path_b = parts[-1][2:]
-                # Prefer b/ path, fallback to a/
-                current_path = path_b or path_a
-            else:
-                current_path = ""
-            current_lines = [line]
-        else:
-            current_lines.append(line)
-    if current_lines and current_path:
-        results.append((current_path, "\n".join(current_lines)))
-    return results
+def get_cumulative_diff_stats(base: str, anchor: str) -> tuple[str, list[tuple[int, int, str]]]:
+    """Return (shortstat, numstat rows) for base..anchor from a single `git diff`.
+
+    Uses -z output, so renamed/copied files are reported under their new path.
+    """
+    out = _run_git(["diff", "-z", "--numstat", "--shortstat", f"{base}..{anchor}"], strip=False)
+    shortstat, rows = _parse_numstat_z(out)
+    return shortstat.strip(), rows
+
+
+def get_commit_bundle(sha: str) -> tuple[dict[str, str], list[str], str]:
+    """Return (meta, files changed, stats) for one commit from a single `git show`.
+
+    `meta` matches get_commit_meta, the file list matches
+    get_commit_files_changed and `stats` matches get_commit_stats.
+    """
+    out = _run_git(
+        [
+            "show",
+            "--no-color",
+            "-z",
+            "--numstat",
+            "--stat",
+            "--date=iso-strict-local",
+            # Same fields as get_commit_meta_bulk, plus %h for the --oneline
+            # header and %P to spot merges
+            "--format=%H%x1f%s%x1f%an <%ae>%x1f%ad%x1f%b%x1f%h%x1f%P%x1e",
+            sha,
+        ],
+        strip=False,
+    )
+    header, _, diff_part = out.partition("\x1e")
+    fields = header.lstrip("\n").split("\x1f")
+    # Merges list files from the combined diff but numstat from the first
+    # parent, so they keep the separate lookups
+    if len(fields) != len(_COMMIT_META_FIELDS) + 2 or len(fields[-1].split()) > 1:
+        return get_commit_meta(sha), get_commit_files_changed(sha), get_commit_stats(sha)
+    *meta_fields, abbrev, _parents = fields
+    meta = {key: value.strip() for key, value in zip(_COMMIT_META_FIELDS, meta_fields)}
+    stat_block, rows = _parse_numstat_z(diff_part.lstrip("\0\n"))
+    stats = f"{abbrev} {meta['subject']}\n{stat_block}".strip()
+    return meta, [path for _, _, path in rows], stats
+
+
+_DIFF_HEADER_RE = re.compile(r"^diff --git ", re.MULTILINE)
+
 
+def split_patch_by_file(patch: str) -> Iterator[tuple[str, str]]:
+    """Lazily split a unified diff into (path, chunk) pairs using 'diff --git a/ b/' markers.
+
+    Chunks are yielded one at a time, so callers that only need a few files
+    can stop early without materializing every chunk. Each chunk is a slice
+    of the patch between headers (found by one regex scan), not a re-join of
+    its lines.
+    """
+    if not patch:
+        return
+    starts = [m.start() for m in _DIFF_HEADER_RE.finditer(patch)]
+    for i, start in enumerate(starts):
+        end = starts[i + 1] - 1 if i + 1 < len(starts) else len(patch)
+        chunk = patch[start:end]
+        if i + 1 == len(starts) and chunk.endswith("\n"):
+            chunk = chunk[:-1]
+        # Parse path from the header line. Format: diff --git a/path b/path
+        header_end = chunk.find("\n")
+        parts = (chunk if header_end < 0 else chunk[:header_end]).strip().split()
+        if len(parts) >= 4 and parts[-2].startswith("a/") and parts[-1].startswith("b/"):
+            # Prefer b/ path, fallback to a/
+            path = parts[-1][2:] or parts[-2][2:]
+            if path:
+                yield path, chunk
+
+
+# Working-tree diffs (commit messages) are cut at this size; git is stopped
+# instead of producing a tail no prompt would use
+MAX_DIFF_BYTES = int(os.getenv("CHACHA_MAX_DIFF_BYTES", "400000"))
+
+
+def _run_git_diff(args: List[str]) -> str:
+    diff, truncated = _run_git_capped(args, MAX_DIFF_BYTES)
+    diff = diff.strip()
+    if truncated:
+        diff += f"\n\n--- [Diff truncated to {MAX_DIFF_BYTES} bytes] ---"
+    return diff
+
+
+@lru_cache(maxsize=1)
 def get_staged_diff() -> str:
-    """Get the diff of all staged files."""
-    return _run_git(["diff", "--cached"]) or ""
+    """Get the diff of all staged files (cached until the index changes)."""
+    # Read-only query: skip the opportunistic index refresh/lock
+    return _run_git_diff(["--no-optional-locks", "diff", "--cached"])
 
 
 def get_unstaged_diff() -> str:
     """Get the diff of all unstaged files."""
-    return _run_git(["diff"]) or ""
+    return _run_git_diff(["diff"])
 
 
 def get_all_changes_diff() -> str:
     """Get the diff of all changes (staged + unstaged)."""
-    staged = get_staged_diff()
-    unstaged = get_unstaged_diff()
+    # The two diffs are independent; run the staged one alongside
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        staged_future = pool.submit(get_staged_diff)
+        unstaged = get_unstaged_diff()
+        staged = staged_future.result()
     if staged and unstaged:
         return f"=== STAGED CHANGES ===\n{staged}\n\n=== UNSTAGED CHANGES ===\n{unstaged}"
     return staged or unstaged
@@ -242,10 +469,8 @@ def get_all_changes_diff() -> str:
 
 def get_staged_files() -> list[str]:
     """Get list of staged files."""
-    out = _run_git(["diff", "--cached", "--name-only"])
-    if not out:
-        return []
-    return [f.strip() for f in out.splitlines() if f.strip()]
+    out = _run_git(["diff", "--cached", "--name-only"], strip=False)
+    return [f for f in out.split("\n") if f]
 
 
 # def get_all_changed_files() -> dict[str, str]:
@@ -286,6 +511,15 @@ def get_staged_files() -> list[str]:
 #     return files
 
 
+def _invalidate_index_caches() -> None:
+    """Drop cached index/ref state after commands that modify it."""
+    get_staged_diff.cache_clear()
+    get_upstream_branch.cache_clear()
+    resolve_commit_sha.cache_clear()
+    for accessor in (_commit_record, get_commit_stats, _commit_patch):
+        accessor.cache_clear()
+
+
 def stage_files(files: list[str] | None = None) -> tuple[bool, str]:
     """Stage the given files.
     
@@ -297,15 +531,22 @@ def stage_files(files: list[str] | None = None) -> tuple[bool, str]:
         If successful, error_message will be empty
     """
     if files is None:
-        files = get_changed_files()
-    if not files:
+        # Everything: let git walk the tree instead of listing files first
+        result = subprocess.run(_git_argv(["add", "-A"]), capture_output=True, text=True, **_SPAWN_OPTIONS)
+    elif not files:
         return True, ""
-    
-    result = subprocess.run(
-        ["git", "add", *files],
-        capture_output=True,
-        text=True,
-    )
+    else:
+        # Paths go through stdin so long selections never hit the argv size
+        # limit; one per line, where git also unquotes the C-style quoting
+        # `status --porcelain` applies to unusual names
+        result = subprocess.run(
+            _git_argv(["add", "--pathspec-from-file=-"]),
+            input="\n".join(files),
+            capture_output=True,
+            text=True,
+            **_SPAWN_OPTIONS,
+        )
+    _invalidate_index_caches()
     
     if result.returncode == 0:
         return True, ""
@@ -317,19 +558,23 @@ def stage_files(files: list[str] | None = None) -> tuple[bool, str]:
 def commit_and_push(branch_name: str, commit_message: str) -> tuple[bool, str]:
     """Commit staged changes and push to the specified remote branch."""
     commit_result = subprocess.run(
-        ["git", "commit", "-m", commit_message],
+        _git_argv(["commit", "-m", commit_message]),
         capture_output=True,
         text=True,
+        **_SPAWN_OPTIONS,
     )
+    _invalidate_index_caches()
     if commit_result.returncode != 0:
         error_msg = commit_result.stderr.strip() or commit_result.stdout.strip() or "Failed to commit changes"
         return False, error_msg
 
     push_result = subprocess.run(
-        ["git", "push", "origin", branch_name],
+        _git_argv(["push", "origin", branch_name]),
         capture_output=True,
         text=True,
+        **_SPAWN_OPTIONS,
     )
+    _invalidate_index_caches()
     if push_result.returncode != 0:
         error_msg = push_result.stderr.strip() or push_result.stdout.strip() or "Failed to push changes"
         return False, error_msg
@@ -337,6 +582,7 @@ def commit_and_push(branch_name: str, commit_message: str) -> tuple[bool, str]:
     return True, ""
 
 
+@lru_cache(maxsize=1)
 def get_upstream_branch() -> str:
     """Return the current upstream branch name without remote prefix, or empty string."""
     upstream = _run_git(["rev-parse", "--abbrev-ref", "--symbolic-full-name", "@{u}"])
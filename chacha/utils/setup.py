@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import os
+import re
 import sys
 import typer
 from dotenv import load_dotenv
 
+from chacha.utils.file_utils import write_text_atomic
 from chacha.utils.ui_utils import format_box
 
 PROVIDER_ANTHROPIC = "anthropic"
@@ -64,23 +66,25 @@ def setup_api_key(provider: str | None = None) -> None:
     # Save to .env
     env_path = os.path.join(os.getcwd(), ".env")
 
-    lines = []
+    content = ""
     if os.path.exists(env_path):
         with open(env_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+            content = f.read()
 
     # Remove existing key for this var to replace it
-    lines = [line for line in lines if not line.strip().startswith(f"{env_var}=")]
+    content = re.sub(rf"^[^\S\n]*{re.escape(env_var)}=.*(?:\n|\Z)", "", content, flags=re.MULTILINE)
 
-    if lines and not lines[-1].endswith("\n"):
-        lines.append("\n")
+    if content and not content.endswith("\n"):
+        content += "\n"
 
-    lines.append(f"{env_var}={api_key}\n")
+    content += f"{env_var}={api_key}\n"
 
-    with open(env_path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+    write_text_atomic(env_path, content)
 
     typer.echo(f"✅ Saved {env_var} to {env_path}")
 
-    # Reload env
-    load_dotenv(override=True)
+    # Reload env and drop provider/key lookups cached before the new key existed
+    load_dotenv(env_path, override=True)
+    from chacha.utils.ai_utils import reset_config_cache
+
+    reset_config_cache()
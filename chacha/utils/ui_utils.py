@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 import shutil
 import textwrap
 from typing import Iterable, Optional
@@ -18,11 +19,16 @@ def _get_terminal_width(default: int = 100) -> int:
         return default
 
 
+# Markdown code fence, possibly indented; matched in place instead of on a
+# stripped copy of every line
+_FENCE_RE = re.compile(r"\s*```")
+
+
 def _wrap_content_lines(content: str, max_width: int) -> list[str]:
     wrapped: list[str] = []
     in_code_block = False
     for line in content.splitlines() or [""]:
-        if line.strip().startswith("```"):
+        if _FENCE_RE.match(line):
             in_code_block = not in_code_block
             wrapped.append(line)
             continue
@@ -53,22 +59,38 @@ def format_box(title: str, content: str, subtitle: Optional[str] = None, width:
     top_border = "┌" + title_segment.center(inner_width, "─") + "┐"
 
     lines: list[str] = [top_border]
+    # Shared by every row: the horizontal rule and the padded text width
+    horiz = "─" * inner_width
+    pad = inner_width - 2
 
     if subtitle:
-        sub = subtitle.strip()
-        for seg in _wrap_content_lines(sub, inner_width - 2):
-            lines.append("│ " + seg.ljust(inner_width - 2) + " │")
-        lines.append("├" + ("─" * inner_width) + "┤")
-    else:
-        lines.append("├" + ("─" * inner_width) + "┤")
+        lines.extend(f"│ {seg:<{pad}} │" for seg in _wrap_content_lines(subtitle.strip(), pad))
+    lines.append(f"├{horiz}┤")
 
-    for seg in _wrap_content_lines(content, inner_width - 2):
-        lines.append("│ " + seg.ljust(inner_width - 2) + " │")
+    lines.extend(f"│ {seg:<{pad}} │" for seg in _wrap_content_lines(content, pad))
 
-    lines.append("└" + ("─" * inner_width) + "┘")
+    lines.append(f"└{horiz}┘")
     return "\n".join(lines)
 
 
+def format_panel(title: str, content: str, subtitle: Optional[str] = None) -> str:
+    """Return a box for terminals, or plain text when stdout is piped/redirected.
+
+    Box borders only get in the way of tools reading the output, so the
+    non-TTY form is '# title' / '# subtitle' header lines followed by content.
+    """
+    try:
+        is_tty = sys.stdout.isatty()
+    except Exception:
+        is_tty = False
+    if is_tty:
+        return format_box(title, content, subtitle=subtitle)
+    header = [f"# {(title or '').strip()}"]
+    if subtitle:
+        header.append(f"# {subtitle.strip()}")
+    return "\n".join(header) + "\n\n" + content
+
+
 class _Spinner:
     def __init__(
         self,